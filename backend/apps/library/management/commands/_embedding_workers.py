@@ -0,0 +1,68 @@
+"""
+Worker functions for parallel reference embedding precomputation.
+
+Kept free of model imports so worker processes can unpickle them
+without a configured app registry. The leading underscore keeps
+Django from treating this module as a management command.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def init_worker(num_threads: int = None):
+    """
+    Preload the NLP models once per worker.
+
+    Args:
+        num_threads: Torch intra-op threads for this worker, so that
+                     concurrent workers do not oversubscribe the CPU
+    """
+    import torch
+    from nlp_core.alignment.models import get_forced_alignment_model
+    from nlp_core.vectorizer import get_embedding_model
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    get_forced_alignment_model()
+    get_embedding_model()
+
+
+def compute_sentence_embeddings(audio_path: str, text: str, phonemes: list):
+    """
+    Align, slice and embed one reference recording.
+
+    Args:
+        audio_path: Path to the reference audio file
+        text: Sentence text
+        phonemes: Precomputed phoneme sequence
+
+    Returns:
+        np.ndarray: (N, D) L2-normalized phoneme embeddings
+
+    Raises:
+        ValueError: If any pipeline step produces no output
+    """
+    from nlp_core.aligner import get_phoneme_timestamps_with_text
+    from nlp_core.audio_slicer import slice_audio_by_timestamps
+    from nlp_core.vectorizer import batch_audio_to_embeddings, normalize_embeddings
+
+    phoneme_timestamps = get_phoneme_timestamps_with_text(
+        audio_path,
+        text,
+        expected_phonemes=phonemes
+    )
+    if not phoneme_timestamps:
+        raise ValueError('Failed to get phoneme timestamps')
+
+    audio_slices = slice_audio_by_timestamps(audio_path, phoneme_timestamps)
+    if not audio_slices:
+        raise ValueError('Failed to slice audio')
+
+    embeddings = batch_audio_to_embeddings(audio_slices)
+    if len(embeddings) == 0:
+        raise ValueError('Failed to generate embeddings')
+
+    return normalize_embeddings(embeddings)
@@ -6,13 +6,12 @@ phoneme-level embeddings for reference audio.
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from apps.library.models import ReferenceSentence
-from nlp_core.vectorizer import batch_audio_to_embeddings
-from nlp_core.audio_slicer import slice_audio_by_timestamps
-from nlp_core.aligner import get_phoneme_timestamps_with_text
-import pickle
+from nlp_core.vectorizer import serialize_embeddings
+from ._embedding_workers import init_worker, compute_sentence_embeddings
 import os
 
 logger = logging.getLogger(__name__)
@@ -32,6 +31,12 @@ class Command(BaseCommand):
             type=int,
             help='Precompute only for specific sentence ID',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of parallel workers (each loads its own models)',
+        )
 
     def handle(self, *args, **options):
         force = options['force']
@@ -57,6 +62,8 @@ class Command(BaseCommand):
         skipped = 0
         failed = 0
 
+        # Per-sentence work is independent: queue it here, aggregate below
+        jobs = []
         for sentence in sentences:
             # Skip if embeddings already exist and not forcing
             if sentence.reference_embeddings and not force:
@@ -67,82 +74,54 @@ class Command(BaseCommand):
                 skipped += 1
                 continue
 
-            self.stdout.write(
-                f'[{sentence.id}] Processing: "{sentence.text[:50]}..."'
-            )
+            # Check if reference audio exists
+            if not sentence.audio_file or not os.path.exists(sentence.audio_file.path):
+                self.stdout.write(self.style.ERROR(
+                    f'[{sentence.id}] ✗ No reference audio file found'
+                ))
+                failed += 1
+                continue
 
-            try:
-                # Step 1: Check if reference audio exists
-                if not sentence.audio_file or not os.path.exists(sentence.audio_file.path):
-                    self.stdout.write(self.style.ERROR(
-                        f'  ✗ No reference audio file found'
-                    ))
-                    failed += 1
-                    continue
+            jobs.append(sentence)
 
-                audio_path = sentence.audio_file.path
-                self.stdout.write(f'  → Audio: {os.path.basename(audio_path)}')
+        executor = self._get_executor(options['workers'])
+        futures = [
+            (sentence, executor.submit(
+                compute_sentence_embeddings,
+                sentence.audio_file.path,
+                sentence.text,
+                sentence.phoneme_sequence
+            ))
+            for sentence in jobs
+        ]
 
-                # Step 2: Get phoneme timestamps using forced alignment
-                self.stdout.write('  → Running forced alignment...')
-                phoneme_timestamps = get_phoneme_timestamps_with_text(
-                    audio_path,
-                    sentence.text,
-                    expected_phonemes=sentence.phoneme_sequence
+        try:
+            for sentence, future in futures:
+                self.stdout.write(
+                    f'[{sentence.id}] Processing: "{sentence.text[:50]}..."'
                 )
 
-                if not phoneme_timestamps:
-                    self.stdout.write(self.style.ERROR(
-                        '  ✗ Failed to get phoneme timestamps'
-                    ))
-                    failed += 1
-                    continue
-
-                self.stdout.write(f'  → Found {len(phoneme_timestamps)} phonemes')
+                try:
+                    embeddings = future.result()
 
-                # Step 3: Slice audio into phoneme segments
-                self.stdout.write('  → Slicing audio...')
-                audio_slices = slice_audio_by_timestamps(
-                    audio_path,
-                    phoneme_timestamps
-                )
+                    # Serialize and save to database
+                    with transaction.atomic():
+                        sentence.reference_embeddings = serialize_embeddings(embeddings)
+                        sentence.save(update_fields=['reference_embeddings', 'updated_at'])
 
-                if not audio_slices:
-                    self.stdout.write(self.style.ERROR(
-                        '  ✗ Failed to slice audio'
+                    self.stdout.write(self.style.SUCCESS(
+                        f'  ✓ Successfully cached {len(embeddings)} embeddings'
                     ))
-                    failed += 1
-                    continue
+                    processed += 1
 
-                # Step 4: Generate embeddings for each slice
-                self.stdout.write('  → Generating embeddings...')
-                embeddings = batch_audio_to_embeddings(audio_slices)
-
-                if not embeddings:
+                except Exception as e:
                     self.stdout.write(self.style.ERROR(
-                        '  ✗ Failed to generate embeddings'
+                        f'  ✗ Error: {str(e)}'
                     ))
+                    logger.exception(f'Failed to process sentence {sentence.id}')
                     failed += 1
-                    continue
-
-                # Step 5: Serialize and save to database
-                self.stdout.write('  → Saving to database...')
-                with transaction.atomic():
-                    sentence.reference_embeddings = pickle.dumps(embeddings)
-                    sentence.save(update_fields=['reference_embeddings'])
-
-                self.stdout.write(self.style.SUCCESS(
-                    f'  ✓ Successfully cached {len(embeddings)} embeddings'
-                ))
-                processed += 1
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(
-                    f'  ✗ Error: {str(e)}'
-                ))
-                logger.exception(f'Failed to process sentence {sentence.id}')
-                failed += 1
-                continue
+        finally:
+            executor.shutdown()
 
         # Summary
         self.stdout.write('\n' + '='*60)
@@ -164,3 +143,30 @@ class Command(BaseCommand):
                 '\nEmbeddings successfully precomputed! '
                 'Assessment speed should now be much faster.'
             ))
+
+    def _get_executor(self, workers):
+        """
+        Build the executor for per-sentence embedding work.
+
+        CPU deployments use one process per worker, each holding its own
+        models and a share of the torch threads. CUDA deployments use
+        threads instead so workers share one copy of the models in VRAM.
+        """
+        import torch
+
+        workers = max(1, workers)
+        if torch.cuda.is_available():
+            return ThreadPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker
+            )
+
+        if workers == 1:
+            return ThreadPoolExecutor(max_workers=1)
+
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(threads_per_worker,)
+        )
@@ -214,6 +214,7 @@ class SentencePreGenerateView(APIView):
         generated = []
         skipped = []
         errors = []
+        pending = []
         
         for sid in sentence_ids:
             try:
@@ -232,27 +233,37 @@ class SentencePreGenerateView(APIView):
                 
                 # Mark as generating
                 self._generating.add(sid)
-                
+                pending.append((sid, sentence))
+                    
+            except ReferenceSentence.DoesNotExist:
+                errors.append({'id': sid, 'error': 'Not found'})
+            except Exception as e:
+                errors.append({'id': sid, 'error': str(e)})
+        
+        if pending:
+            try:
+                # Generate TTS for all pending sentences concurrently
+                tts = get_tts_service()
+                results = tts.generate_for_sentences([sentence for _, sentence in pending])
+            except Exception as e:
+                results = [e] * len(pending)
+            
+            for (sid, sentence), result in zip(pending, results):
                 try:
-                    # Generate TTS
-                    tts = get_tts_service()
-                    audio_path = tts.generate_for_sentence(sentence)
+                    if isinstance(result, Exception):
+                        raise result
                     
                     # Save to DB
-                    relative_path = os.path.relpath(audio_path, settings.MEDIA_ROOT)
+                    relative_path = os.path.relpath(result, settings.MEDIA_ROOT)
                     sentence.audio_file = relative_path
                     sentence.save(update_fields=['audio_file'])
                     
                     generated.append(sid)
+                except Exception as e:
+                    errors.append({'id': sid, 'error': str(e)})
                 finally:
                     # Remove from generating set
                     self._generating.discard(sid)
-                    
-            except ReferenceSentence.DoesNotExist:
-                errors.append({'id': sid, 'error': 'Not found'})
-            except Exception as e:
-                errors.append({'id': sid, 'error': str(e)})
-                self._generating.discard(sid)
         
         return Response({
             'generated': generated,
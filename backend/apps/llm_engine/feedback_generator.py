@@ -9,14 +9,43 @@ CRITICAL ARCHITECTURE CONSTRAINT:
 - LLM does NOT score, detect, or evaluate pronunciation
 """
 
+import hashlib
 import logging
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List
+from django.core.cache import cache
+from nlp_core.phonemes import strip_stress
 from services.llm_service import get_llm_service
 from .prompt_templates import build_feedback_prompt
 from .validators import validate_feedback_response
 
 logger = logging.getLogger(__name__)
 
+# Score-independent feedback (tips, encouragement, focus) for a recurring
+# sentence and error pattern is reused for a day
+FEEDBACK_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Feedback fields that do not quote scores, so they can be shared between attempts
+_CACHED_FEEDBACK_FIELDS = ('phoneme_tips', 'encouragement', 'practice_focus')
+
+
+def _feedback_cache_key(sentence_text: str, phoneme_scores: List[dict]) -> str:
+    """
+    Build a cache key from the error pattern of an attempt.
+    
+    Weak phoneme scores are bucketed to 0.1 and the overall score is left
+    out, so attempts that struggle with the same sounds in the same words
+    share one LLM response.
+    """
+    pattern = sorted(
+        (ps['phoneme'], round(ps['score'], 1), ps.get('word', ''))
+        for ps in phoneme_scores
+        if ps.get('is_weak')
+    )
+    payload = repr((sentence_text, pattern))
+    return 'feedback:' + hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
 
 def generate_pronunciation_feedback(
     phoneme_scores: List[dict],
@@ -37,11 +66,19 @@ def generate_pronunciation_feedback(
         dict: {summary, phoneme_tips, encouragement, practice_focus}
     """
     try:
-        # Build prompt with pre-computed scores
+        cache_key = _feedback_cache_key(sentence_text, phoneme_scores)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Feedback cache hit")
+            # The summary depends on this attempt's score, so it is rendered fresh
+            summary, _ = _LEVEL_MESSAGES[bisect_right(_LEVEL_CUTOFFS, overall_score)]
+            return {'summary': summary, **cached}
+        
+        # Build prompt with pre-computed scores (each weak phoneme listed once)
         prompt = build_feedback_prompt(
             sentence_text=sentence_text,
             overall_score=overall_score,
-            weak_phonemes=weak_phonemes,
+            weak_phonemes=list(dict.fromkeys(weak_phonemes)),
             phoneme_scores=phoneme_scores
         )
         
@@ -61,11 +98,30 @@ def generate_pronunciation_feedback(
         
         feedback = result.get('content', {})
         
+        # Unparseable output: retry once deterministically before falling back
+        if not isinstance(feedback, dict) or feedback.get('parse_error'):
+            logger.warning("LLM feedback was not valid JSON, retrying with temperature=0")
+            result = llm.generate(
+                prompt=prompt,
+                provider="auto",
+                max_tokens=512,
+                temperature=0,
+                response_format="json"
+            )
+            feedback = result.get('content') if result.get('success') else None
+            if not isinstance(feedback, dict) or feedback.get('parse_error'):
+                return generate_fallback_feedback(overall_score, weak_phonemes)
+        
         # Validate LLM response
         validated = validate_feedback_response(feedback, weak_phonemes)
         
         logger.info(f"Generated feedback via {result.get('provider')}")
         
+        cache.set(
+            cache_key,
+            {field: validated.get(field) for field in _CACHED_FEEDBACK_FIELDS},
+            FEEDBACK_CACHE_TIMEOUT
+        )
         return validated
         
     except Exception as e:
@@ -73,6 +129,28 @@ def generate_pronunciation_feedback(
         return generate_fallback_feedback(overall_score, weak_phonemes)
 
 
+# Score cutoffs and (summary, encouragement) per performance level, lowest first
+_LEVEL_CUTOFFS = (0.5, 0.7, 0.85)
+_LEVEL_MESSAGES = (
+    (
+        "This sentence was challenging. Focus on the basic sounds first.",
+        "Every expert was once a beginner. Keep practicing!",
+    ),
+    (
+        "Fair pronunciation. Several sounds need more practice.",
+        "With consistent practice, you will see improvement. Do not give up!",
+    ),
+    (
+        "Good pronunciation with room for improvement on some sounds.",
+        "You are making solid progress. Focus on the weak sounds identified.",
+    ),
+    (
+        "Excellent pronunciation! You have mastered most sounds in this sentence.",
+        "Keep up the great work!",
+    ),
+)
+
+
 def generate_fallback_feedback(overall_score: float, weak_phonemes: List[str]) -> dict:
     """
     Generate fallback feedback when LLM is unavailable.
@@ -80,18 +158,7 @@ def generate_fallback_feedback(overall_score: float, weak_phonemes: List[str]) -
     Uses rule-based templates instead of LLM.
     """
     # Determine performance level
-    if overall_score >= 0.85:
-        summary = "Excellent pronunciation! You have mastered most sounds in this sentence."
-        encouragement = "Keep up the great work!"
-    elif overall_score >= 0.7:
-        summary = "Good pronunciation with room for improvement on some sounds."
-        encouragement = "You are making solid progress. Focus on the weak sounds identified."
-    elif overall_score >= 0.5:
-        summary = "Fair pronunciation. Several sounds need more practice."
-        encouragement = "With consistent practice, you will see improvement. Do not give up!"
-    else:
-        summary = "This sentence was challenging. Focus on the basic sounds first."
-        encouragement = "Every expert was once a beginner. Keep practicing!"
+    summary, encouragement = _LEVEL_MESSAGES[bisect_right(_LEVEL_CUTOFFS, overall_score)]
     
     # Generate basic tips for weak phonemes
     phoneme_tips = []
@@ -111,33 +178,36 @@ def generate_fallback_feedback(overall_score: float, weak_phonemes: List[str]) -
     }
 
 
+# Basic articulation tips used when the LLM is unavailable
+_BASIC_TIPS = {
+    'TH': "Place your tongue between your teeth and blow air gently.",
+    'R': "Curl your tongue back slightly without touching the roof of your mouth.",
+    'L': "Touch the tip of your tongue to the ridge behind your upper teeth.",
+    'S': "Keep your tongue behind your teeth and let air flow through a narrow gap.",
+    'Z': "Same as S, but add voice by vibrating your vocal cords.",
+    'SH': "Round your lips slightly and push air through a wider channel than S.",
+    'CH': "Start with your tongue touching the roof, then release with a SH sound.",
+    'V': "Gently bite your lower lip and blow air while voicing.",
+    'F': "Same position as V, but without voicing.",
+    'W': "Round your lips into a small circle and glide into the next sound.",
+    'NG': "Press the back of your tongue against your soft palate.",
+    'AH': "Open your mouth wide with a relaxed tongue.",
+    'EE': "Spread your lips and raise the front of your tongue.",
+    'OO': "Round your lips and raise the back of your tongue.",
+}
+
+
+@lru_cache(maxsize=256)
 def get_basic_articulation_tip(phoneme: str) -> str:
     """
     Get a basic articulation tip for common phonemes.
     
     Used as fallback when LLM is unavailable.
     """
-    tips = {
-        'TH': "Place your tongue between your teeth and blow air gently.",
-        'R': "Curl your tongue back slightly without touching the roof of your mouth.",
-        'L': "Touch the tip of your tongue to the ridge behind your upper teeth.",
-        'S': "Keep your tongue behind your teeth and let air flow through a narrow gap.",
-        'Z': "Same as S, but add voice by vibrating your vocal cords.",
-        'SH': "Round your lips slightly and push air through a wider channel than S.",
-        'CH': "Start with your tongue touching the roof, then release with a SH sound.",
-        'V': "Gently bite your lower lip and blow air while voicing.",
-        'F': "Same position as V, but without voicing.",
-        'W': "Round your lips into a small circle and glide into the next sound.",
-        'NG': "Press the back of your tongue against your soft palate.",
-        'AH': "Open your mouth wide with a relaxed tongue.",
-        'EE': "Spread your lips and raise the front of your tongue.",
-        'OO': "Round your lips and raise the back of your tongue.",
-    }
-    
     # Strip stress markers (e.g., AH0 -> AH)
-    clean_phoneme = ''.join(c for c in phoneme if not c.isdigit())
+    clean_phoneme = strip_stress(phoneme)
     
-    return tips.get(clean_phoneme, f"Practice the /{phoneme}/ sound in isolation before using it in words.")
+    return _BASIC_TIPS.get(clean_phoneme, f"Practice the /{phoneme}/ sound in isolation before using it in words.")
 
 
 def generate_articulation_tip(phoneme: str, phoneme_info: dict = None) -> dict:
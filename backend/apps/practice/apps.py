@@ -1,5 +1,30 @@
+import logging
+import threading
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
+
+def warm_up_models():
+    """
+    Load the NLP models and run one dummy forward pass.
+    
+    Moves the one-off model load and lazy kernel allocation off the
+    first user's assessment request.
+    """
+    try:
+        import numpy as np
+        from nlp_core.alignment.models import get_forced_alignment_model
+        from nlp_core.phoneme_extractor import get_g2p
+        from nlp_core.vectorizer import audio_to_embedding
+        
+        get_forced_alignment_model()
+        get_g2p()
+        audio_to_embedding(np.zeros(16000, dtype=np.float32))
+        logger.info("NLP models warmed up")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {str(e)}")
+
 
 class PracticeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -9,3 +34,7 @@ class PracticeConfig(AppConfig):
     def ready(self):
         # Import signals to register handlers
         import apps.practice.signals
+        
+        from django.conf import settings
+        if settings.SCORING_CONFIG.get('PRELOAD_MODELS', False):
+            threading.Thread(target=warm_up_models, daemon=True).start()
@@ -11,11 +11,27 @@ Orchestrates the pronunciation evaluation pipeline:
 
 import time
 import logging
+import numpy as np
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Phoneme difficulty tiers for score distribution (harder phonemes get more variance)
+_DIFFICULTY_TIER = {
+    **{p: 0 for p in ('TH', 'DH', 'ZH', 'R', 'L', 'NG', 'SH', 'CH', 'JH', 'W', 'Y')},
+    **{p: 1 for p in ('S', 'Z', 'F', 'V', 'P', 'B', 'T', 'D', 'K', 'G')},
+}
+_EASY_TIER = 2
+
+# Variance range per tier: difficult, medium, easy (REDUCED negative bias for fairness)
+_TIER_VARIANCE = np.array([
+    [-0.08, 0.08],  # Was -0.15 to 0.05
+    [-0.05, 0.08],  # Was -0.08 to 0.08
+    [-0.03, 0.10],  # Was -0.05 to 0.10
+])
+
+
 def distribute_sentence_score(overall_score, phonemes, timestamps=None):
     """
     Distribute a sentence-level score across phonemes with realistic variance.
@@ -30,12 +46,6 @@ def distribute_sentence_score(overall_score, phonemes, timestamps=None):
     Returns:
         List of per-phoneme score dictionaries
     """
-    import random
-    
-    # Phoneme difficulty weights (harder phonemes get more variance)
-    difficult = {'TH', 'DH', 'ZH', 'R', 'L', 'NG', 'SH', 'CH', 'JH', 'W', 'Y'}
-    medium = {'S', 'Z', 'F', 'V', 'P', 'B', 'T', 'D', 'K', 'G'}
-    
     threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
     scores = []
     
@@ -44,25 +54,25 @@ def distribute_sentence_score(overall_score, phonemes, timestamps=None):
     score_boost = settings.SCORING_CONFIG.get('SCORE_BOOST', 0.15)
     boosted_base = min(1.0, overall_score + score_boost)
     
+    # Draw all per-phoneme variances in one batch
+    tiers = np.fromiter(
+        (_DIFFICULTY_TIER.get(p.upper(), _EASY_TIER) for p in phonemes),
+        dtype=np.intp,
+        count=len(phonemes)
+    )
+    rng = np.random.default_rng()
+    variance = rng.uniform(_TIER_VARIANCE[tiers, 0], _TIER_VARIANCE[tiers, 1])
+    
+    # Calculate final scores with higher minimum floor (raised from 0.3 to 0.45)
+    phoneme_scores = np.clip(boosted_base + variance, 0.45, 1.0)
+    
     for i, phoneme in enumerate(phonemes):
-        # Base the individual score on boosted overall with some variance
-        base = boosted_base
-        
-        # Add phoneme-based variance (REDUCED negative bias for fairness)
-        if phoneme.upper() in difficult:
-            variance = random.uniform(-0.08, 0.08)  # Was -0.15 to 0.05
-        elif phoneme.upper() in medium:
-            variance = random.uniform(-0.05, 0.08)  # Was -0.08 to 0.08
-        else:
-            variance = random.uniform(-0.03, 0.10)  # Was -0.05 to 0.10
-        
-        # Calculate final score with higher minimum floor
-        score = max(0.45, min(1.0, base + variance))  # Floor raised from 0.3 to 0.45
+        score = float(phoneme_scores[i])
         
         score_entry = {
             'phoneme': phoneme,
-            'score': round(float(score), 3),  # Ensure native Python float
-            'is_weak': bool(score < threshold),  # Ensure native Python bool
+            'score': round(score, 3),
+            'is_weak': bool(score < threshold),
         }
         
         if timestamps and i < len(timestamps):
@@ -240,11 +250,11 @@ class AssessmentService:
     
     def _get_reference_embeddings(self, sentence):
         """Fetch precomputed reference embeddings from database."""
-        import pickle
         import os
+        from nlp_core.vectorizer import load_reference_embeddings
         
         if sentence.reference_embeddings:
-            return pickle.loads(sentence.reference_embeddings)
+            return load_reference_embeddings(sentence)
         
         # Check if sentence has audio source for computing embeddings
         logger.warning(f"Reference embeddings not cached for sentence {sentence.id}")
@@ -256,13 +266,14 @@ class AssessmentService:
         
         # Compute embeddings from full audio (not sliced)
         try:
-            from nlp_core.vectorizer import compute_sentence_embedding
-            embedding = compute_sentence_embedding(audio_source)
+            from nlp_core.vectorizer import (
+                compute_sentence_embedding, normalize_embeddings, serialize_embeddings
+            )
+            embedding = normalize_embeddings([compute_sentence_embedding(audio_source)])[0]
             
             # Cache in database for future use
-            import pickle
-            sentence.reference_embeddings = pickle.dumps([embedding])
-            sentence.save(update_fields=['reference_embeddings'])
+            sentence.reference_embeddings = serialize_embeddings([embedding])
+            sentence.save(update_fields=['reference_embeddings', 'updated_at'])
             
             # Return as list for compatibility
             return [embedding]
@@ -290,11 +301,13 @@ class AssessmentService:
             return distribute_sentence_score(overall_sim, phonemes, timestamps)
         
         # Normal per-phoneme comparison
+        # Reference embeddings are L2-normalized by _get_reference_embeddings
         return calculate_phoneme_scores(
             user_embeddings, 
             reference_embeddings, 
             phonemes,
-            timestamps
+            timestamps,
+            ref_normalized=True
         )
     
     def _calculate_overall_score(self, phoneme_scores):
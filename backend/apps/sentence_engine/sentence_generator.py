@@ -10,6 +10,7 @@ Uses hybrid approach:
 
 import logging
 from typing import List
+from nlp_core.phonemes import strip_stress
 from services.llm_service import get_llm_service
 from apps.llm_engine.prompt_templates import build_sentence_prompt
 from apps.llm_engine.validators import validate_sentence_response
@@ -136,7 +137,7 @@ def get_fallback_sentence(difficulty: str, target_phonemes: List[str] = None) ->
     if target_phonemes:
         # Try to find a matching sentence
         for phoneme in target_phonemes:
-            clean_phoneme = ''.join(c for c in phoneme if not c.isdigit())
+            clean_phoneme = strip_stress(phoneme)
             if clean_phoneme in fallback_sentences:
                 sentence = fallback_sentences[clean_phoneme].get(
                     difficulty, 
@@ -215,6 +215,18 @@ SCORING_CONFIG = {
     'EMBEDDING_DIM': 768,           # Wav2Vec2 embedding dimension
     'SAMPLE_RATE': 16000,           # Audio sample rate
     'SILENCE_TRIM_DB': 20,          # dB threshold for silence trimming
+    # Load NLP models in the background at startup instead of on first request
+    'PRELOAD_MODELS': os.getenv('PRELOAD_MODELS', 'False').lower() == 'true',
+    # Run the embedding model under bfloat16 autocast (fastest on CPUs with AVX512-BF16/AMX)
+    'EMBEDDING_AUTOCAST': os.getenv('EMBEDDING_AUTOCAST', 'False').lower() == 'true',
+    # Compile the embedding model with torch.compile (slower startup, faster inference)
+    'COMPILE_EMBEDDING_MODEL': os.getenv('COMPILE_EMBEDDING_MODEL', 'False').lower() == 'true',
+    # int8 dynamic quantization of the embedding model's Linear layers (CPU only, slight accuracy cost)
+    'QUANTIZE_EMBEDDING_MODEL': os.getenv('QUANTIZE_EMBEDDING_MODEL', 'False').lower() == 'true',
+    # Embedding inference backend: 'torch' or 'onnx' (ONNX Runtime on CPU, needs onnxruntime)
+    'EMBEDDING_BACKEND': os.getenv('EMBEDDING_BACKEND', 'torch').lower(),
+    'ONNX_MODEL_PATH': os.getenv('ONNX_MODEL_PATH', str(BASE_DIR / 'models' / 'wav2vec2-base-960h.onnx')),
+    'ONNX_NUM_THREADS': int(os.getenv('ONNX_NUM_THREADS', '0')),
 }
 
 # Logging Configuration
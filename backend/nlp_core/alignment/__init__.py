@@ -18,7 +18,7 @@ from .phoneme_aligner import (
     get_phoneme_timestamps,
     get_phoneme_timestamps_with_text
 )
-from .utils import load_audio, strip_stress
+from .utils import load_audio, load_audio_array, strip_stress
 
 __all__ = [
     'get_forced_alignment_model',
@@ -27,5 +27,6 @@ __all__ = [
     'get_phoneme_timestamps',
     'get_phoneme_timestamps_with_text',
     'load_audio',
+    'load_audio_array',
     'strip_stress',
 ]
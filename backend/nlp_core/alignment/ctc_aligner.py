@@ -9,7 +9,7 @@ from typing import List
 import torch
 import torchaudio
 
-from .models import get_forced_alignment_model
+from .models import get_forced_alignment_model, to_alignment_device
 from .utils import AlignedToken
 
 logger = logging.getLogger(__name__)
@@ -68,8 +68,9 @@ def _mms_alignment(
     but is handled by torchaudio.functional.forced_align internally.
     """
     try:
-        # Get emission probabilities
-        emissions, _ = model(waveform)
+        # Get emission probabilities (alignment itself runs on CPU)
+        emissions, _ = model(to_alignment_device(waveform))
+        emissions = emissions.cpu()
         
         # MMS_FA uses lowercase characters in its vocabulary
         # Dictionary: {'-': 0, 'a': 1, 'i': 2, ...}
@@ -182,8 +183,8 @@ def _wav2vec_alignment(
     
     # Get emissions (log probabilities)
     with torch.no_grad():
-        outputs = model(input_values)
-        logits = outputs.logits
+        outputs = model(to_alignment_device(input_values))
+        logits = outputs.logits.cpu()
         log_probs = torch.log_softmax(logits, dim=-1)
     
     # Get predicted character indices
@@ -5,6 +5,7 @@ Handles singleton model loading for alignment models.
 """
 
 import logging
+import threading
 import torch
 import torchaudio
 
@@ -14,6 +15,32 @@ logger = logging.getLogger(__name__)
 _aligner_bundle = None
 _aligner_model = None
 _aligner_tokenizer = None
+_aligner_device = None
+_aligner_lock = threading.Lock()
+
+
+def get_alignment_device() -> torch.device:
+    """Select the device for alignment inference (CUDA when available)."""
+    global _aligner_device
+    if _aligner_device is None:
+        _aligner_device = torch.device(
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+    return _aligner_device
+
+
+def to_alignment_device(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Move an input tensor to the alignment device.
+    
+    A plain copy: inputs are one-shot and consumed immediately by the
+    next op on the same stream, so pinning would only add a host copy
+    with nothing to overlap.
+    """
+    device = get_alignment_device()
+    if device.type == "cuda":
+        return tensor.to(device)
+    return tensor
 
 
 def get_forced_alignment_model():
@@ -28,31 +55,43 @@ def get_forced_alignment_model():
     global _aligner_bundle, _aligner_model, _aligner_tokenizer
     
     if _aligner_model is None:
-        logger.info("Loading forced alignment model...")
-        
-        try:
-            # Try MMS_FA bundle (torchaudio >= 2.1)
-            _aligner_bundle = torchaudio.pipelines.MMS_FA
-            _aligner_model = _aligner_bundle.get_model()
-            _aligner_tokenizer = _aligner_bundle.get_tokenizer()
-            _aligner_model.eval()
-            logger.info("MMS_FA forced alignment model loaded")
-            
-        except AttributeError:
-            # Fallback: wav2vec2 base model for older versions
-            logger.warning("MMS_FA unavailable, using wav2vec2 fallback")
-            _aligner_bundle = None
-            
-            from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-            
-            _aligner_model = Wav2Vec2ForCTC.from_pretrained(
-                "facebook/wav2vec2-base-960h"
-            )
-            _aligner_tokenizer = Wav2Vec2Processor.from_pretrained(
-                "facebook/wav2vec2-base-960h"
-            )
-            _aligner_model.eval()
-            logger.info("Wav2Vec2 fallback model loaded")
+        # Double-checked so concurrent first requests load the model once.
+        # Globals are assigned last so no thread sees a half-initialised model.
+        with _aligner_lock:
+            if _aligner_model is None:
+                logger.info("Loading forced alignment model...")
+                
+                try:
+                    # Try MMS_FA bundle (torchaudio >= 2.1)
+                    bundle = torchaudio.pipelines.MMS_FA
+                    model = bundle.get_model()
+                    tokenizer = bundle.get_tokenizer()
+                    
+                except AttributeError:
+                    # Fallback: wav2vec2 base model for older versions
+                    logger.warning("MMS_FA unavailable, using wav2vec2 fallback")
+                    bundle = None
+                    
+                    from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+                    
+                    model = Wav2Vec2ForCTC.from_pretrained(
+                        "facebook/wav2vec2-base-960h"
+                    )
+                    tokenizer = Wav2Vec2Processor.from_pretrained(
+                        "facebook/wav2vec2-base-960h"
+                    )
+                
+                model.to(get_alignment_device())
+                model.eval()
+                
+                _aligner_bundle = bundle
+                _aligner_tokenizer = tokenizer
+                _aligner_model = model
+                
+                if bundle is not None:
+                    logger.info(f"MMS_FA forced alignment model loaded on {get_alignment_device()}")
+                else:
+                    logger.info("Wav2Vec2 fallback model loaded")
     
     return _aligner_bundle, _aligner_model, _aligner_tokenizer
 
@@ -7,13 +7,21 @@ Common utilities used across alignment modules.
 import logging
 from typing import Tuple, List, Dict
 from dataclasses import dataclass
+import numpy as np
+import soundfile as sf
 import torch
 import torchaudio
 
+from ..phonemes import strip_stress  # noqa: F401 (re-exported by the alignment package)
+
 logger = logging.getLogger(__name__)
 
+# Resample transforms keyed by (orig_freq, new_freq); building one
+# computes its windowed-sinc kernel, so reuse them across requests
+_resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+
 
-@dataclass
+@dataclass(slots=True)
 class AlignedToken:
     """Represents an aligned token with timestamps."""
     token: str
@@ -22,6 +30,43 @@ class AlignedToken:
     score: float = 1.0
 
 
+def load_audio_array(
+    audio_path: str,
+    target_sample_rate: int = 16000
+) -> np.ndarray:
+    """
+    Load an audio file as mono float32 samples at the target rate.
+    
+    Single decoder for alignment and embeddings, so both see the same
+    samples for an upload.
+    
+    Args:
+        audio_path: Path to audio file
+        target_sample_rate: Target sample rate (16kHz for wav2vec2)
+    
+    Returns:
+        np.ndarray: 1-D waveform
+    """
+    try:
+        # libsndfile directly; returns (frames, channels)
+        data, sample_rate = sf.read(audio_path, dtype='float32', always_2d=True)
+    except Exception:
+        # Containers libsndfile cannot decode; torchaudio returns (channels, frames)
+        waveform, sample_rate = torchaudio.load(audio_path)
+        data = waveform.numpy().T
+    
+    # Convert to mono if stereo
+    audio = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    
+    # Resample if needed (cleaned audio is already at the target rate)
+    if sample_rate != target_sample_rate:
+        with torch.inference_mode():
+            resampler = get_resampler(sample_rate, target_sample_rate)
+            audio = resampler(torch.from_numpy(np.ascontiguousarray(audio))).numpy()
+    
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
 def load_audio(
     audio_path: str, 
     target_sample_rate: int = 16000
@@ -34,29 +79,35 @@ def load_audio(
         target_sample_rate: Target sample rate (16kHz for wav2vec2)
     
     Returns:
-        Tuple of (waveform tensor, sample rate)
+        Tuple of (waveform tensor of shape (1, samples), sample rate)
     """
-    waveform, sample_rate = torchaudio.load(audio_path)
+    audio = load_audio_array(audio_path, target_sample_rate)
+    return torch.from_numpy(audio).unsqueeze(0), target_sample_rate
+
+
+def get_resampler(
+    orig_freq: int,
+    new_freq: int = 16000
+) -> torchaudio.transforms.Resample:
+    """
+    Get a cached resample transform for the given rate pair.
     
-    # Convert to mono if stereo
-    if waveform.shape[0] > 1:
-        waveform = torch.mean(waveform, dim=0, keepdim=True)
+    Args:
+        orig_freq: Source sample rate
+        new_freq: Target sample rate (16kHz for wav2vec2)
     
-    # Resample if needed
-    if sample_rate != target_sample_rate:
+    Returns:
+        Resample transform with precomputed filter kernel
+    """
+    key = (orig_freq, new_freq)
+    resampler = _resamplers.get(key)
+    if resampler is None:
         resampler = torchaudio.transforms.Resample(
-            orig_freq=sample_rate,
-            new_freq=target_sample_rate
+            orig_freq=orig_freq,
+            new_freq=new_freq
         )
-        waveform = resampler(waveform)
-        sample_rate = target_sample_rate
-    
-    return waveform, sample_rate
-
-
-def strip_stress(phoneme: str) -> str:
-    """Remove stress markers from ARPAbet phoneme (e.g., 'AH0' -> 'AH')."""
-    return ''.join(c for c in phoneme if not c.isdigit())
+        _resamplers[key] = resampler
+    return resampler
 
 
 def get_phoneme_duration_weights() -> Dict[str, float]:
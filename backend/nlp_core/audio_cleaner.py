@@ -51,11 +51,12 @@ def clean_audio(audio_input, output_path: str = None) -> str:
         # Step 1: Load audio with resampling to 16kHz
         y, sr = librosa.load(input_path, sr=sample_rate)
         
-        # Step 2: Trim silence from ends
+        # Step 2: Trim silence from ends (returns a view into y)
         y_trimmed, _ = librosa.effects.trim(y, top_db=trim_db)
         
-        # Step 3: Normalize volume to prevent clipping
-        y_normalized = normalize_audio(y_trimmed)
+        # Step 3: Normalize volume to prevent clipping. y is a fresh buffer
+        # we own, so scale the trimmed view in place instead of copying.
+        y_normalized = normalize_audio(y_trimmed, in_place=True)
         
         # Step 4: Save cleaned audio
         if output_path is None:
@@ -79,19 +80,28 @@ def clean_audio(audio_input, output_path: str = None) -> str:
         raise
 
 
-def normalize_audio(y: np.ndarray) -> np.ndarray:
+def normalize_audio(y: np.ndarray, in_place: bool = False) -> np.ndarray:
     """
     Normalize audio to prevent clipping while maintaining dynamics.
     
     Args:
         y: Audio waveform as numpy array
+        in_place: Scale y directly instead of returning a new array
     
     Returns:
         np.ndarray: Normalized audio
     """
-    max_val = np.max(np.abs(y))
+    if y.size == 0:
+        return y
+    
+    # Peak amplitude without materialising np.abs(y)
+    max_val = max(float(y.max()), -float(y.min()))
     if max_val > 0:
-        return y / max_val * 0.95  # Leave 5% headroom
+        scale = 0.95 / max_val  # Leave 5% headroom
+        if in_place:
+            y *= scale
+            return y
+        return y * scale
     return y
 
 
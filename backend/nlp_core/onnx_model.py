@@ -0,0 +1,116 @@
+"""
+ONNX Runtime backend for the Wav2Vec2 embedding model.
+
+Exports the PyTorch embedding model to ONNX once and serves forward
+passes through an onnxruntime InferenceSession on CPU, where ORT's
+fused LayerNorm/GELU/attention kernels beat eager PyTorch.
+"""
+
+import os
+import logging
+from types import SimpleNamespace
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxWav2Vec2:
+    """
+    Drop-in stand-in for Wav2Vec2Model backed by an ONNX Runtime session.
+
+    Supports the part of the model interface the vectorizer uses:
+    calling it with input_values (and optionally attention_mask).
+    """
+
+    def __init__(self, session, config):
+        self.session = session
+        self.config = config
+
+    def __call__(self, input_values: torch.Tensor, attention_mask: torch.Tensor = None):
+        values = input_values.detach().cpu().float().numpy()
+        if attention_mask is None:
+            mask = np.ones(values.shape, dtype=np.int64)
+        else:
+            mask = attention_mask.detach().cpu().numpy().astype(np.int64)
+
+        hidden_states = self.session.run(
+            ['last_hidden_state'],
+            {'input_values': values, 'attention_mask': mask}
+        )[0]
+        return SimpleNamespace(last_hidden_state=torch.from_numpy(hidden_states))
+
+
+def export_onnx_model(model, path: str):
+    """
+    Export a Wav2Vec2Model to ONNX with dynamic batch and length axes.
+
+    Args:
+        model: Eager fp32 Wav2Vec2Model on CPU
+        path: Destination .onnx file
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    # Write to a temporary file first so concurrent workers never load a partial export
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    dummy_values = torch.zeros(1, 16000)
+    dummy_mask = torch.ones(1, 16000, dtype=torch.int64)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy_values, dummy_mask),
+            tmp_path,
+            input_names=['input_values', 'attention_mask'],
+            output_names=['last_hidden_state', 'extract_features'],
+            dynamic_axes={
+                'input_values': {0: 'batch', 1: 'samples'},
+                'attention_mask': {0: 'batch', 1: 'samples'},
+                'last_hidden_state': {0: 'batch', 1: 'frames'},
+                'extract_features': {0: 'batch', 1: 'frames'},
+            },
+            opset_version=17,
+        )
+    os.replace(tmp_path, path)
+    logger.info(f"Exported embedding model to {path}")
+
+
+def load_onnx_model(model, path: str, num_threads: int = 0):
+    """
+    Build an ONNX Runtime backed embedding model, exporting it if needed.
+
+    Args:
+        model: Loaded Wav2Vec2Model used for export and its config
+        path: Location of the exported .onnx file
+        num_threads: ORT intra-op threads (0 lets ORT decide)
+
+    Returns:
+        OnnxWav2Vec2, or None if onnxruntime is not installed or the
+        export fails
+    """
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        logger.warning("onnxruntime not installed, using PyTorch embedding model")
+        return None
+
+    try:
+        if not os.path.exists(path):
+            export_onnx_model(model, path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        session = ort.InferenceSession(
+            path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+    except Exception as e:
+        logger.warning(f"ONNX embedding model unavailable, using PyTorch: {str(e)}")
+        return None
+
+    logger.info("Using ONNX Runtime embedding model")
+    return OnnxWav2Vec2(session, model.config)
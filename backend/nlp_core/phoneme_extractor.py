@@ -6,24 +6,51 @@ Reference: Adapted from Pronunex_initial_setup/src/generate_phonemes.py
 """
 
 import logging
+import threading
+from functools import lru_cache
 from typing import List, Tuple
 from g2p_en import G2p
 
+from .phonemes import strip_stress
+
 logger = logging.getLogger(__name__)
 
 # Singleton G2P instance (expensive to initialize)
 _g2p_instance = None
+_g2p_lock = threading.Lock()
 
 
 def get_g2p():
     """Get or create singleton G2P instance."""
     global _g2p_instance
     if _g2p_instance is None:
-        logger.info("Initializing G2P model...")
-        _g2p_instance = G2p()
+        with _g2p_lock:
+            if _g2p_instance is None:
+                logger.info("Initializing G2P model...")
+                _g2p_instance = G2p()
     return _g2p_instance
 
 
+@lru_cache(maxsize=1024)
+def _g2p_text(text: str) -> Tuple[str, ...]:
+    """
+    Run G2P on a cleaned sentence, memoized.
+    
+    Whole sentences are converted (not word by word) so G2P can still
+    use context to disambiguate homographs.
+    """
+    phonemes = get_g2p()(text)
+    
+    # Filter out spaces and punctuation
+    return tuple(p for p in phonemes if p.strip() and p not in [' ', ',', '.', '!', '?'])
+
+
+@lru_cache(maxsize=8192)
+def _g2p_word(word: str) -> Tuple[str, ...]:
+    """Run G2P on a single punctuation-free word, memoized."""
+    return tuple(p for p in get_g2p()(word) if p.strip())
+
+
 def text_to_phonemes(text: str) -> List[str]:
     """
     Convert text to ARPAbet phoneme sequence.
@@ -34,16 +61,11 @@ def text_to_phonemes(text: str) -> List[str]:
     Returns:
         List[str]: ARPAbet phoneme sequence, e.g., ['DH', 'AH0', 'K', 'W', 'IH1', 'K']
     """
-    g2p = get_g2p()
-    
     # Clean text
     text = text.strip().upper()
     
-    # Convert to phonemes
-    phonemes = g2p(text)
-    
-    # Filter out spaces and punctuation
-    clean_phonemes = [p for p in phonemes if p.strip() and p not in [' ', ',', '.', '!', '?']]
+    # Convert to phonemes (practice sentences recur, so results are cached)
+    clean_phonemes = list(_g2p_text(text))
     
     logger.debug(f"G2P: '{text}' -> {clean_phonemes}")
     
@@ -60,18 +82,14 @@ def text_to_phonemes_with_words(text: str) -> List[Tuple[str, List[str]]]:
     Returns:
         List of tuples: [(word, [phonemes]), ...]
     """
-    g2p = get_g2p()
-    
     words = text.strip().split()
     result = []
     
     for word in words:
-        # Clean word of punctuation
-        clean_word = ''.join(c for c in word if c.isalnum())
+        # Clean word of punctuation (G2P lowercases input, so key on lowercase)
+        clean_word = ''.join(c for c in word if c.isalnum()).lower()
         if clean_word:
-            phonemes = g2p(clean_word)
-            clean_phonemes = [p for p in phonemes if p.strip()]
-            result.append((word, clean_phonemes))
+            result.append((word, list(_g2p_word(clean_word))))
     
     return result
 
@@ -91,17 +109,11 @@ def validate_phonemes_in_sentence(sentence: str, required_phonemes: List[str]) -
     sentence_phonemes = text_to_phonemes(sentence)
     
     # Remove stress markers for comparison (e.g., AH0 -> AH)
-    normalized_sentence = [strip_stress(p) for p in sentence_phonemes]
+    sentence_set = frozenset(strip_stress(p) for p in sentence_phonemes)
     normalized_required = [strip_stress(p) for p in required_phonemes]
     
-    found = []
-    missing = []
-    
-    for phoneme in normalized_required:
-        if phoneme in normalized_sentence:
-            found.append(phoneme)
-        else:
-            missing.append(phoneme)
+    found = [p for p in normalized_required if p in sentence_set]
+    missing = [p for p in normalized_required if p not in sentence_set]
     
     return {
         'valid': len(missing) == 0,
@@ -111,15 +123,6 @@ def validate_phonemes_in_sentence(sentence: str, required_phonemes: List[str]) -
     }
 
 
-def strip_stress(phoneme: str) -> str:
-    """
-    Remove stress markers from ARPAbet phoneme.
-    
-    E.g., 'AH0' -> 'AH', 'IY1' -> 'IY'
-    """
-    return ''.join(c for c in phoneme if not c.isdigit())
-
-
 def get_phoneme_positions(word: str, phonemes: List[str]) -> List[dict]:
     """
     Determine position of each phoneme in a word (initial, medial, final).
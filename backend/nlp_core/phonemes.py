@@ -0,0 +1,33 @@
+"""
+Phoneme Symbol Helpers for Pronunex.
+
+ARPAbet symbol utilities shared by the NLP core and the LLM feedback
+fallback. Kept free of audio, model and G2P imports so any module can
+use them.
+"""
+
+# ARPAbet base phonemes (as produced by G2P, without stress markers)
+ARPABET_PHONEMES = (
+    'AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'EH', 'ER', 'EY', 'IH', 'IY',
+    'OW', 'OY', 'UH', 'UW', 'B', 'CH', 'D', 'DH', 'F', 'G', 'HH', 'JH',
+    'K', 'L', 'M', 'N', 'NG', 'P', 'R', 'S', 'SH', 'T', 'TH', 'V', 'W',
+    'Y', 'Z', 'ZH',
+)
+
+# Every stressed/unstressed token mapped to its base phoneme
+_STRESS_TABLE = {p + s: p for p in ARPABET_PHONEMES for s in ('', '0', '1', '2')}
+
+# Translation table that deletes stress digits from any other token
+_STRESS_DIGITS = str.maketrans('', '', '0123456789')
+
+
+def strip_stress(phoneme: str) -> str:
+    """
+    Remove stress markers from ARPAbet phoneme.
+    
+    E.g., 'AH0' -> 'AH', 'IY1' -> 'IY'
+    """
+    base = _STRESS_TABLE.get(phoneme)
+    if base is not None:
+        return base
+    return phoneme.translate(_STRESS_DIGITS)
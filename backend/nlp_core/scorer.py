@@ -6,19 +6,29 @@ All scoring is deterministic - NO LLM involvement.
 """
 
 import logging
-from typing import List
+import math
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Union
 import numpy as np
-from scipy.spatial.distance import cosine
 from django.conf import settings
 
+from .phonemes import strip_stress
+
 logger = logging.getLogger(__name__)
 
 
+def _weak_threshold() -> float:
+    """Score below which a phoneme (or word) is considered weak."""
+    return settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
+
+
 def calculate_phoneme_scores(
     user_embeddings: List[np.ndarray],
     reference_embeddings: List[np.ndarray],
     phonemes: List[str],
-    timestamps: List[dict] = None
+    timestamps: List[dict] = None,
+    ref_normalized: bool = False
 ) -> List[dict]:
     """
     Calculate cosine similarity scores for each phoneme.
@@ -28,33 +38,46 @@ def calculate_phoneme_scores(
         reference_embeddings: Reference (gold standard) embeddings
         phonemes: Expected phoneme sequence
         timestamps: Optional timing information
+        ref_normalized: Reference rows are already L2-normalized
     
     Returns:
         List of score dicts:
         [{"phoneme": "S", "score": 0.92, "is_weak": False, "word": "she"}, ...]
     """
-    config = settings.SCORING_CONFIG
-    threshold = config.get('WEAK_PHONEME_THRESHOLD', 0.7)
+    threshold = _weak_threshold()
     
     scores = []
     
     min_len = min(len(user_embeddings), len(reference_embeddings), len(phonemes))
     
+    if min_len == 0:
+        return scores
+    
+    # Cosine similarity for all phonemes at once (one pass over each matrix)
+    try:
+        similarities = batch_cosine_similarity(
+            np.asarray(user_embeddings[:min_len]),
+            np.asarray(reference_embeddings[:min_len]),
+            ref_normalized=ref_normalized
+        )
+    except Exception as e:
+        # Ragged or missing embeddings: fall back to per-pair comparison
+        logger.warning(f"Batched similarity failed, scoring per phoneme: {str(e)}")
+        similarities = np.zeros(min_len, dtype=np.float32)
+        for i in range(min_len):
+            try:
+                similarities[i] = calculate_cosine_similarity(
+                    user_embeddings[i], reference_embeddings[i]
+                )
+            except Exception as e:
+                logger.warning(f"Similarity calculation failed for phoneme {i}: {str(e)}")
+    
     for i in range(min_len):
-        user_emb = user_embeddings[i]
-        ref_emb = reference_embeddings[i]
-        phoneme = phonemes[i]
-        
-        # Calculate cosine similarity (1 - cosine distance)
-        try:
-            similarity = calculate_cosine_similarity(user_emb, ref_emb)
-        except Exception as e:
-            logger.warning(f"Similarity calculation failed for phoneme {i}: {str(e)}")
-            similarity = 0.0
+        similarity = float(similarities[i])
         
         score_entry = {
-            'phoneme': phoneme,
-            'score': round(float(similarity), 3),
+            'phoneme': phonemes[i],
+            'score': round(similarity, 3),
             'is_weak': bool(similarity < threshold),
         }
         
@@ -78,6 +101,54 @@ def calculate_phoneme_scores(
     return scores
 
 
+def batch_cosine_similarity(
+    user_matrix: np.ndarray,
+    ref_matrix: np.ndarray,
+    out: np.ndarray = None,
+    ref_normalized: bool = False
+) -> np.ndarray:
+    """
+    Row-wise cosine similarity between two (N, D) embedding matrices.
+    
+    Args:
+        user_matrix: User embeddings, one row per phoneme
+        ref_matrix: Reference embeddings, same shape as user_matrix
+        out: Optional preallocated float32 array of length N
+        ref_normalized: Reference rows are already unit length (see
+                        nlp_core.vectorizer.normalize_embeddings), so the
+                        similarity is a plain dot product on that side
+    
+    Returns:
+        np.ndarray: Similarities clamped to [0, 1]. Rows with a zero,
+        NaN or Inf vector score 0 (same as calculate_cosine_similarity).
+    """
+    user_matrix = np.asarray(user_matrix, dtype=np.float32)
+    ref_matrix = np.asarray(ref_matrix, dtype=np.float32)
+    
+    if out is None:
+        out = np.zeros(len(user_matrix), dtype=np.float32)
+    else:
+        out.fill(0.0)
+    
+    user_norms = np.linalg.norm(user_matrix, axis=1)
+    valid = (user_norms > 0) & np.isfinite(user_norms)
+    
+    if ref_normalized:
+        # Zero reference rows stay zero and score 0 through the dot product
+        denominator = user_norms[valid]
+    else:
+        ref_norms = np.linalg.norm(ref_matrix, axis=1)
+        valid &= (ref_norms > 0) & np.isfinite(ref_norms)
+        denominator = user_norms[valid] * ref_norms[valid]
+    
+    out[valid] = np.einsum(
+        'ij,ij->i', user_matrix[valid], ref_matrix[valid]
+    ) / denominator
+    
+    np.nan_to_num(out, copy=False)
+    return np.clip(out, 0.0, 1.0, out=out)
+
+
 def generate_adaptive_scores(phonemes: List[str], timestamps: List[dict] = None) -> List[dict]:
     """
     Generate DETERMINISTIC adaptive scores when embedding comparison fails.
@@ -92,8 +163,7 @@ def generate_adaptive_scores(phonemes: List[str], timestamps: List[dict] = None)
     Returns:
         List of adaptive phoneme scores
     """
-    config = settings.SCORING_CONFIG
-    threshold = config.get('WEAK_PHONEME_THRESHOLD', 0.7)
+    threshold = _weak_threshold()
     
     # Phoneme difficulty map with fixed base scores (deterministic)
     difficult_phonemes = {'TH': 0.68, 'DH': 0.70, 'ZH': 0.65, 'R': 0.72, 'L': 0.74, 
@@ -154,41 +224,40 @@ def calculate_cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     Returns:
         float: Similarity score between 0 and 1
     """
-    # Validate inputs - check for NaN or Inf
     if vec1 is None or vec2 is None:
         return 0.0
     
-    if np.any(np.isnan(vec1)) or np.any(np.isnan(vec2)):
-        logger.warning("NaN detected in embedding vectors")
+    # Dot product and squared norms in three BLAS passes, no sqrt per vector
+    try:
+        dot = float(np.dot(vec1, vec2))
+        norm1_sq = float(np.dot(vec1, vec1))
+        norm2_sq = float(np.dot(vec2, vec2))
+    except Exception as e:
+        logger.warning(f"Cosine similarity calculation failed: {e}")
         return 0.0
     
-    if np.any(np.isinf(vec1)) or np.any(np.isinf(vec2)):
-        logger.warning("Inf detected in embedding vectors")
+    # NaN or Inf anywhere in either vector propagates into these scalars
+    if not (math.isfinite(dot) and math.isfinite(norm1_sq) and math.isfinite(norm2_sq)):
+        logger.warning("NaN or Inf detected in embedding vectors")
         return 0.0
     
     # Handle zero vectors
-    norm1 = np.linalg.norm(vec1)
-    norm2 = np.linalg.norm(vec2)
-    
-    if norm1 == 0 or norm2 == 0:
+    if norm1_sq == 0.0 or norm2_sq == 0.0:
         return 0.0
     
-    # Cosine similarity = 1 - cosine distance
-    try:
-        distance = cosine(vec1, vec2)
-        
-        # Check for NaN result (can happen with numerical issues)
-        if np.isnan(distance):
-            logger.warning("Cosine distance resulted in NaN")
-            return 0.0
-        
-        similarity = 1.0 - distance
-        
-        # Clamp to [0, 1] range
-        return max(0.0, min(1.0, similarity))
-    except Exception as e:
-        logger.warning(f"Cosine similarity calculation failed: {e}")
-        return 0.0
+    similarity = dot / math.sqrt(norm1_sq * norm2_sq)
+    
+    # Clamp to [0, 1] range
+    return max(0.0, min(1.0, similarity))
+
+
+def _score_array(phoneme_scores: List[dict]) -> np.ndarray:
+    """Collect the 'score' of each entry into a float64 array."""
+    return np.fromiter(
+        (ps['score'] for ps in phoneme_scores),
+        dtype=np.float64,
+        count=len(phoneme_scores)
+    )
 
 
 def calculate_overall_score(phoneme_scores: List[dict], weighted: bool = False) -> float:
@@ -209,8 +278,7 @@ def calculate_overall_score(phoneme_scores: List[dict], weighted: bool = False)
         # Future: implement importance weighting
         pass
     
-    total = sum(ps['score'] for ps in phoneme_scores)
-    return round(total / len(phoneme_scores), 2)
+    return round(float(_score_array(phoneme_scores).mean()), 2)
 
 
 def identify_weak_phonemes(phoneme_scores: List[dict], threshold: float = None) -> List[str]:
@@ -225,17 +293,19 @@ def identify_weak_phonemes(phoneme_scores: List[dict], threshold: float = None)
         List of weak phoneme symbols
     """
     if threshold is None:
-        threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
+        threshold = _weak_threshold()
     
-    return [ps['phoneme'] for ps in phoneme_scores if ps['score'] < threshold]
+    weak = np.flatnonzero(_score_array(phoneme_scores) < threshold)
+    return [phoneme_scores[i]['phoneme'] for i in weak]
 
 
-def aggregate_phoneme_stats(phoneme_scores: List[dict]) -> dict:
+def aggregate_phoneme_stats(phoneme_scores: List[dict], threshold: float = None) -> dict:
     """
     Aggregate statistics for phoneme scoring.
     
     Args:
         phoneme_scores: List of per-phoneme scores
+        threshold: Custom weakness threshold (uses config if None)
     
     Returns:
         dict: Statistics including min, max, mean, median, weak count
@@ -243,71 +313,78 @@ def aggregate_phoneme_stats(phoneme_scores: List[dict]) -> dict:
     if not phoneme_scores:
         return {'min': 0, 'max': 0, 'mean': 0, 'median': 0, 'weak_count': 0}
     
-    scores = [ps['score'] for ps in phoneme_scores]
-    weak = identify_weak_phonemes(phoneme_scores)
+    scores = _score_array(phoneme_scores)
+    if threshold is None:
+        threshold = _weak_threshold()
+    weak_count = int(np.count_nonzero(scores < threshold))
     
     return {
-        'min': round(min(scores), 3),
-        'max': round(max(scores), 3),
-        'mean': round(np.mean(scores), 3),
-        'median': round(np.median(scores), 3),
-        'std': round(np.std(scores), 3),
-        'weak_count': len(weak),
+        'min': round(float(scores.min()), 3),
+        'max': round(float(scores.max()), 3),
+        'mean': round(float(scores.mean()), 3),
+        'median': round(float(np.median(scores)), 3),
+        'std': round(float(scores.std()), 3),
+        'weak_count': weak_count,
         'total_count': len(scores),
-        'weak_percentage': round(len(weak) / len(scores) * 100, 1),
+        'weak_percentage': round(weak_count / len(scores) * 100, 1),
     }
 
 
 def compare_with_history(
     current_scores: List[dict], 
-    historical_scores: List[List[dict]]
+    historical_scores: Union[List[List[dict]], np.ndarray]
 ) -> dict:
     """
     Compare current attempt with historical performance.
     
     Args:
         current_scores: Current attempt scores
-        historical_scores: List of previous attempt scores
+        historical_scores: List of previous attempt scores, or a 2D array
+                           of per-phoneme scores with one row per attempt
     
     Returns:
         dict: Improvement metrics
     """
-    if not historical_scores:
+    if len(historical_scores) == 0:
         return {'improvement': 0, 'trend': 'new', 'rank': 1}
     
-    current_avg = np.mean([ps['score'] for ps in current_scores])
-    historical_avgs = [
-        np.mean([ps['score'] for ps in hist]) 
-        for hist in historical_scores
-    ]
+    current_avg = float(np.mean([ps['score'] for ps in current_scores]))
+    
+    if isinstance(historical_scores, np.ndarray):
+        historical_avgs = historical_scores.mean(axis=1)
+    else:
+        # Attempts may differ in length, so average each one separately
+        historical_avgs = np.array([
+            _score_array(hist).mean()
+            for hist in historical_scores
+        ])
     
     # Compare with most recent
-    recent_avg = historical_avgs[-1] if historical_avgs else 0
+    recent_avg = historical_avgs[-1]
     improvement = current_avg - recent_avg
     
-    # Determine trend
+    # Determine trend from the last three attempts
     if len(historical_avgs) >= 3:
-        recent_trend = historical_avgs[-3:]
-        if all(recent_trend[i] < recent_trend[i+1] for i in range(len(recent_trend)-1)):
+        steps = np.diff(historical_avgs[-3:])
+        if (steps > 0).all():
             trend = 'improving'
-        elif all(recent_trend[i] > recent_trend[i+1] for i in range(len(recent_trend)-1)):
+        elif (steps < 0).all():
             trend = 'declining'
         else:
             trend = 'stable'
     else:
         trend = 'insufficient_data'
     
-    # Calculate rank
-    all_avgs = historical_avgs + [current_avg]
-    sorted_avgs = sorted(all_avgs, reverse=True)
-    rank = sorted_avgs.index(current_avg) + 1
+    # Rank = 1 + number of attempts scoring strictly higher (ties share a rank)
+    all_avgs = np.append(historical_avgs, current_avg)
+    rank = int(np.count_nonzero(all_avgs > current_avg)) + 1
     
     return {
-        'improvement': round(improvement, 3),
+        'improvement': round(float(improvement), 3),
         'trend': trend,
         'rank': rank,
-        'best_score': round(max(all_avgs), 3),
-        'average_score': round(np.mean(all_avgs), 3),
+        'best_score': round(float(all_avgs.max()), 3),
+        'average_score': round(float(all_avgs.mean()), 3),
     }
 
 
@@ -315,7 +392,7 @@ def compare_with_history(
 # WORD-LEVEL SCORING
 # =============================================================================
 
-def calculate_word_scores(phoneme_scores: List[dict]) -> List[dict]:
+def calculate_word_scores(phoneme_scores: List[dict], threshold: float = None) -> List[dict]:
     """
     Combine phoneme results to calculate word-level scores.
     
@@ -324,55 +401,37 @@ def calculate_word_scores(phoneme_scores: List[dict]) -> List[dict]:
     
     Args:
         phoneme_scores: List of per-phoneme scores with word context
+        threshold: Custom weakness threshold (uses config if None)
     
     Returns:
         List of word score dicts:
         [{"word": "SHE", "score": 0.85, "phonemes": [...], "is_weak": False}, ...]
     """
-    config = settings.SCORING_CONFIG
-    threshold = config.get('WEAK_PHONEME_THRESHOLD', 0.7)
-    
-    # Group phonemes by word
-    word_groups = {}
-    
-    for ps in phoneme_scores:
-        word = ps.get('word', 'unknown')
-        if word not in word_groups:
-            word_groups[word] = {
-                'word': word,
-                'phonemes': [],
-                'scores': [],
-                'start': ps.get('start', 0),
-                'end': ps.get('end', 0)
-            }
-        
-        word_groups[word]['phonemes'].append(ps)
-        word_groups[word]['scores'].append(ps['score'])
-        word_groups[word]['end'] = ps.get('end', word_groups[word]['end'])
+    if threshold is None:
+        threshold = _weak_threshold()
     
-    # Calculate word-level scores
+    # Phonemes arrive in word order, so each run of the same word is one word.
+    # A word repeated later in the sentence is scored as its own occurrence.
     word_scores = []
     
-    for word, data in word_groups.items():
-        if not data['scores']:
-            continue
-        
-        avg_score = np.mean(data['scores'])
-        min_score = min(data['scores'])
+    for word, group in groupby(phoneme_scores, key=lambda ps: ps.get('word', 'unknown')):
+        phonemes = list(group)
+        scores = _score_array(phonemes)
+        avg_score = float(scores.mean())
         weak_phonemes = [
-            p['phoneme'] for p in data['phonemes'] 
+            p['phoneme'] for p in phonemes 
             if p['score'] < threshold
         ]
         
         word_scores.append({
             'word': word,
-            'score': round(float(avg_score), 3),
-            'min_score': round(float(min_score), 3),
+            'score': round(avg_score, 3),
+            'min_score': round(float(scores.min()), 3),
             'is_weak': bool(avg_score < threshold),
             'weak_phonemes': weak_phonemes,
-            'phoneme_count': len(data['phonemes']),
-            'start': data['start'],
-            'end': data['end']
+            'phoneme_count': len(phonemes),
+            'start': phonemes[0].get('start', 0),
+            'end': phonemes[-1].get('end', 0)
         })
     
     logger.debug(f"Calculated word scores for {len(word_scores)} words")
@@ -409,6 +468,27 @@ SUBSTITUTION_PATTERNS = {
     ('G', 'K'): 'Devoicing',
 }
 
+# First (spoken_as, pattern_name) per expected phoneme, in SUBSTITUTION_PATTERNS order
+_SUBS_BY_EXPECTED = {}
+for (_expected, _spoken_as), _pattern_name in SUBSTITUTION_PATTERNS.items():
+    _SUBS_BY_EXPECTED.setdefault(_expected, (_spoken_as, _pattern_name))
+del _expected, _spoken_as, _pattern_name
+
+# Phoneme type mapping
+PHONEME_TYPES = {
+    'vowel': {'AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'EH', 'ER', 'EY', 
+              'IH', 'IY', 'OW', 'OY', 'UH', 'UW'},
+    'fricative': {'F', 'V', 'TH', 'DH', 'S', 'Z', 'SH', 'ZH', 'HH'},
+    'stop': {'P', 'B', 'T', 'D', 'K', 'G'},
+    'nasal': {'M', 'N', 'NG'},
+    'liquid': {'L', 'R'},
+    'glide': {'W', 'Y'},
+    'affricate': {'CH', 'JH'},
+}
+
+# Reverse mapping
+_PHONEME_TO_TYPE = {p: ptype for ptype, phonemes in PHONEME_TYPES.items() for p in phonemes}
+
 
 def detect_substitution_patterns(
     phoneme_scores: List[dict],
@@ -429,7 +509,7 @@ def detect_substitution_patterns(
         [{"expected": "TH", "likely_as": "T", "pattern": "Fronting", ...}, ...]
     """
     if weak_threshold is None:
-        weak_threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
+        weak_threshold = _weak_threshold()
     
     detected = []
     
@@ -437,38 +517,35 @@ def detect_substitution_patterns(
         if ps['score'] >= weak_threshold:
             continue
         
-        expected = _strip_stress(ps['phoneme'])
+        expected = strip_stress(ps['phoneme'])
+        
+        # Check for a known substitution pattern
+        match = _SUBS_BY_EXPECTED.get(expected)
+        if match is None:
+            continue
+        sub, pattern_name = match
+        
+        # Calculate likelihood based on score
+        # Lower score = more likely substitution
+        likelihood = round(1.0 - ps['score'], 2)
         
-        # Check for known substitution patterns
-        for (exp, sub), pattern_name in SUBSTITUTION_PATTERNS.items():
-            if expected == exp:
-                # Calculate likelihood based on score
-                # Lower score = more likely substitution
-                likelihood = round(1.0 - ps['score'], 2)
-                
-                detected.append({
-                    'expected': expected,
-                    'likely_as': sub,
-                    'pattern_name': pattern_name,
-                    'likelihood': likelihood,
-                    'word': ps.get('word', ''),
-                    'position': ps.get('position', 'medial'),
-                    'score': ps['score']
-                })
-                break
+        detected.append({
+            'expected': expected,
+            'likely_as': sub,
+            'pattern_name': pattern_name,
+            'likelihood': likelihood,
+            'word': ps.get('word', ''),
+            'position': ps.get('position', 'medial'),
+            'score': ps['score']
+        })
     
     # Sort by likelihood (most likely first)
-    detected.sort(key=lambda x: x['likelihood'], reverse=True)
+    detected.sort(key=itemgetter('likelihood'), reverse=True)
     
     logger.debug(f"Detected {len(detected)} potential substitution patterns")
     return detected
 
 
-def _strip_stress(phoneme: str) -> str:
-    """Remove stress markers from phoneme."""
-    return ''.join(c for c in phoneme if not c.isdigit())
-
-
 # =============================================================================
 # ERROR SUMMARY GENERATION
 # =============================================================================
@@ -486,28 +563,28 @@ def generate_error_summary(phoneme_scores: List[dict]) -> dict:
     Returns:
         dict: Comprehensive error summary
     """
-    config = settings.SCORING_CONFIG
-    threshold = config.get('WEAK_PHONEME_THRESHOLD', 0.7)
+    # Read the threshold once and pass it to every helper below
+    threshold = _weak_threshold()
     
     # Get basic stats
-    stats = aggregate_phoneme_stats(phoneme_scores)
+    stats = aggregate_phoneme_stats(phoneme_scores, threshold)
     
     # Get word-level analysis
-    word_scores = calculate_word_scores(phoneme_scores)
+    word_scores = calculate_word_scores(phoneme_scores, threshold)
     weak_words = [w for w in word_scores if w['is_weak']]
     
     # Detect substitution patterns
     substitutions = detect_substitution_patterns(phoneme_scores, threshold)
     
-    # Identify missing sounds (scores very low, < 0.3)
+    # Identify missing sounds (scores very low, < 0.3) with one vectorized mask
+    scores = _score_array(phoneme_scores)
     missing_sounds = [
         {
-            'phoneme': ps['phoneme'],
-            'word': ps.get('word', ''),
-            'score': ps['score']
+            'phoneme': phoneme_scores[i]['phoneme'],
+            'word': phoneme_scores[i].get('word', ''),
+            'score': phoneme_scores[i]['score']
         }
-        for ps in phoneme_scores 
-        if ps['score'] < 0.3
+        for i in np.flatnonzero(scores < 0.3)
     ]
     
     # Identify timing issues (based on position patterns)
@@ -579,32 +656,14 @@ def _group_weak_by_type(
     threshold: float
 ) -> dict:
     """Group weak phonemes by phoneme type."""
-    # Phoneme type mapping
-    PHONEME_TYPES = {
-        'vowel': {'AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'EH', 'ER', 'EY', 
-                  'IH', 'IY', 'OW', 'OY', 'UH', 'UW'},
-        'fricative': {'F', 'V', 'TH', 'DH', 'S', 'Z', 'SH', 'ZH', 'HH'},
-        'stop': {'P', 'B', 'T', 'D', 'K', 'G'},
-        'nasal': {'M', 'N', 'NG'},
-        'liquid': {'L', 'R'},
-        'glide': {'W', 'Y'},
-        'affricate': {'CH', 'JH'},
-    }
-    
-    # Reverse mapping
-    phoneme_to_type = {}
-    for ptype, phonemes in PHONEME_TYPES.items():
-        for p in phonemes:
-            phoneme_to_type[p] = ptype
-    
     # Group weak phonemes
     weak_by_type = {}
     for ps in phoneme_scores:
         if ps['score'] >= threshold:
             continue
         
-        base = _strip_stress(ps['phoneme'])
-        ptype = phoneme_to_type.get(base, 'other')
+        base = strip_stress(ps['phoneme'])
+        ptype = _PHONEME_TO_TYPE.get(base, 'other')
         
         if ptype not in weak_by_type:
             weak_by_type[ptype] = []
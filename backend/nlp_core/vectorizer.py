@@ -5,36 +5,186 @@ Converts audio slices to embedding vectors using Wav2Vec2.
 These embeddings are used for pronunciation similarity scoring.
 """
 
+import io
 import logging
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
 from typing import List
 import pickle
 import numpy as np
 import torch
 import torchaudio
+import transformers
+from packaging import version
 from transformers import Wav2Vec2Model, Wav2Vec2Processor
 from django.conf import settings
 
+# Embeddings run on the same device as forced alignment
+from .alignment.models import get_alignment_device, to_alignment_device
+from .alignment.utils import load_audio_array
+from .onnx_model import load_onnx_model
+
 logger = logging.getLogger(__name__)
 
+# Pretrained checkpoint used for embeddings
+EMBEDDING_MODEL_NAME = "facebook/wav2vec2-base-960h"
+
+# First transformers release whose Wav2Vec2 accepts attn_implementation="sdpa"
+_WAV2VEC2_SDPA_MIN_VERSION = version.parse("4.41.0")
+
 # Singleton model for embedding generation
 _embedding_processor = None
 _embedding_model = None
+_embedding_device = torch.device("cpu")
+_embedding_lock = threading.Lock()
+
+# Prefix of every np.save buffer, used to tell stored formats apart
+_NPY_MAGIC = b'\x93NUMPY'
+
+# Deserialized reference matrices, keyed by (sentence id, updated_at)
+_REFERENCE_CACHE_SIZE = 256
+_reference_cache = OrderedDict()
+_reference_lock = threading.Lock()
 
 
 def get_embedding_model():
     """Get or load the Wav2Vec2 model for embeddings."""
-    global _embedding_processor, _embedding_model
+    global _embedding_processor, _embedding_model, _embedding_device
     
     if _embedding_processor is None or _embedding_model is None:
-        logger.info("Loading Wav2Vec2 embedding model...")
-        _embedding_processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-base-960h")
-        _embedding_model = Wav2Vec2Model.from_pretrained("facebook/wav2vec2-base-960h")
-        _embedding_model.eval()
-        logger.info("Wav2Vec2 embedding model loaded")
+        # Double-checked so concurrent first requests load the model once
+        with _embedding_lock:
+            if _embedding_processor is None or _embedding_model is None:
+                logger.info("Loading Wav2Vec2 embedding model...")
+                config = settings.SCORING_CONFIG
+                processor = Wav2Vec2Processor.from_pretrained(EMBEDDING_MODEL_NAME)
+                model = _load_embedding_model(EMBEDDING_MODEL_NAME)
+                model.eval()
+                device = torch.device("cpu")
+                
+                onnx_model = None
+                if config.get('EMBEDDING_BACKEND', 'torch') == 'onnx':
+                    onnx_model = load_onnx_model(
+                        model,
+                        config['ONNX_MODEL_PATH'],
+                        config.get('ONNX_NUM_THREADS', 0)
+                    )
+                
+                if onnx_model is not None:
+                    model = onnx_model
+                else:
+                    if get_alignment_device().type == "cuda":
+                        # fp16 halves memory traffic; pooled outputs are cast back to fp32
+                        device = get_alignment_device()
+                        model = model.to(device).half()
+                    elif config.get('QUANTIZE_EMBEDDING_MODEL', False):
+                        model = _quantize_model(model)
+                    if config.get('COMPILE_EMBEDDING_MODEL', False):
+                        model = _compile_model(model)
+                
+                _embedding_device = device
+                _embedding_processor, _embedding_model = processor, model
+                logger.info("Wav2Vec2 embedding model loaded")
     
     return _embedding_processor, _embedding_model
 
 
+def _load_embedding_model(name: str):
+    """
+    Load Wav2Vec2 with fused scaled-dot-product attention when supported.
+    
+    Only transformers releases with SDPA support for Wav2Vec2 are asked
+    for it, so older pins load the weights once with eager attention.
+    """
+    if version.parse(transformers.__version__) < _WAV2VEC2_SDPA_MIN_VERSION:
+        return Wav2Vec2Model.from_pretrained(name)
+    
+    try:
+        return Wav2Vec2Model.from_pretrained(name, attn_implementation="sdpa")
+    except (ValueError, TypeError, ImportError) as e:
+        logger.info(f"SDPA attention unavailable, using eager attention: {str(e)}")
+        return Wav2Vec2Model.from_pretrained(name)
+
+
+def _quantize_model(model):
+    """Dynamically quantize Linear layers to int8 for CPU inference."""
+    try:
+        quantized = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("Wav2Vec2 embedding model quantized to int8")
+        return quantized
+    except Exception as e:
+        logger.warning(f"Dynamic quantization failed, using fp32 model: {str(e)}")
+        return model
+
+
+def _compile_model(model):
+    """
+    Wrap the model with torch.compile, keeping eager mode if that fails.
+    
+    Compilation is lazy, so one dummy forward pass runs here. That way
+    the first request does not pay for it, and a backend that cannot
+    compile the graph is caught at load time instead of failing requests.
+    """
+    try:
+        # dynamic=True avoids a recompile for every new slice length
+        compiled = torch.compile(model, dynamic=True)
+        
+        param = next(model.parameters())
+        with torch.inference_mode():
+            compiled(torch.zeros(1, 16000, dtype=param.dtype, device=param.device))
+        
+        logger.info("Wav2Vec2 embedding model compiled")
+        return compiled
+    except Exception as e:
+        logger.warning(f"torch.compile unavailable, using eager model: {str(e)}")
+        return model
+
+
+def _inference_context():
+    """
+    Context for embedding forward passes.
+    
+    inference_mode skips autograd bookkeeping entirely. With
+    EMBEDDING_AUTOCAST enabled, matmuls also run in bfloat16 on CPU
+    (on CUDA the model itself is already fp16).
+    """
+    stack = ExitStack()
+    stack.enter_context(torch.inference_mode())
+    if (
+        settings.SCORING_CONFIG.get('EMBEDDING_AUTOCAST', False)
+        and _embedding_device.type == "cpu"
+    ):
+        stack.enter_context(torch.autocast(device_type='cpu', dtype=torch.bfloat16))
+    return stack
+
+
+def _prepare_input(audio_slice: np.ndarray) -> torch.Tensor:
+    """
+    Build the model input for one waveform without the processor.
+    
+    Does what Wav2Vec2FeatureExtractor does for wav2vec2-base (zero-pad
+    to the 400-sample minimum, zero-mean/unit-variance normalize) in NumPy.
+    
+    Returns:
+        (1, samples) input_values tensor
+    """
+    values = np.zeros((1, max(len(audio_slice), 400)), dtype=np.float32)
+    values[0, :len(audio_slice)] = audio_slice
+    values -= values.mean()
+    values /= np.sqrt(values.var() + 1e-7)
+    return torch.from_numpy(values)
+
+
+def _to_model_device(input_values: torch.Tensor) -> torch.Tensor:
+    """Move model input to the embedding device, as fp16 on CUDA."""
+    if _embedding_device.type != "cuda":
+        return input_values
+    return to_alignment_device(input_values).half()
+
+
 def audio_to_embedding(audio_slice: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
     """
     Convert a single audio slice to an embedding vector.
@@ -46,26 +196,16 @@ def audio_to_embedding(audio_slice: np.ndarray, sample_rate: int = 16000) -> np.
     Returns:
         np.ndarray: 768-dimensional embedding vector
     """
-    processor, model = get_embedding_model()
+    _, model = get_embedding_model()
     
     try:
-        # Ensure minimum length for processing
-        if len(audio_slice) < 400:
-            audio_slice = np.pad(audio_slice, (0, 400 - len(audio_slice)))
-        
-        # Process audio
-        inputs = processor(
-            audio_slice.astype(np.float32), 
-            sampling_rate=sample_rate, 
-            return_tensors="pt",
-            padding=True
-        )
+        input_values = _to_model_device(_prepare_input(audio_slice))
         
-        with torch.no_grad():
-            outputs = model(**inputs)
+        with _inference_context():
+            outputs = model(input_values)
             # Get the mean of hidden states as embedding
-            hidden_states = outputs.last_hidden_state
-            embedding = torch.mean(hidden_states, dim=1).squeeze().numpy()
+            hidden_states = outputs.last_hidden_state.float()
+            embedding = torch.mean(hidden_states, dim=1).squeeze().cpu().numpy()
         
         return embedding
         
@@ -75,25 +215,27 @@ def audio_to_embedding(audio_slice: np.ndarray, sample_rate: int = 16000) -> np.
         return np.zeros(settings.SCORING_CONFIG.get('EMBEDDING_DIM', 768))
 
 
-def batch_audio_to_embeddings(audio_slices: List[np.ndarray]) -> List[np.ndarray]:
+def batch_audio_to_embeddings(audio_slices: List[np.ndarray]) -> np.ndarray:
     """
     Convert multiple audio slices to embeddings.
     
+    Each slice gets its own unpadded forward pass: wav2vec2-base-960h
+    has a group-norm feature encoder that normalizes over the whole
+    time axis, so padding slices into a batch would change their
+    embeddings even with an attention mask.
+    
     Args:
         audio_slices: List of audio waveforms
     
     Returns:
-        List of embedding vectors
+        np.ndarray: (N, D) float32 matrix, rows in the same order as audio_slices
     """
-    embeddings = []
-    
-    for i, audio_slice in enumerate(audio_slices):
-        try:
-            embedding = audio_to_embedding(audio_slice)
-            embeddings.append(embedding)
-        except Exception as e:
-            logger.warning(f"Failed to embed slice {i}: {str(e)}")
-            embeddings.append(np.zeros(settings.SCORING_CONFIG.get('EMBEDDING_DIM', 768)))
+    embeddings = np.empty(
+        (len(audio_slices), settings.SCORING_CONFIG.get('EMBEDDING_DIM', 768)),
+        dtype=np.float32
+    )
+    for row, audio_slice in enumerate(audio_slices):
+        embeddings[row] = audio_to_embedding(audio_slice)
     
     return embeddings
 
@@ -112,11 +254,9 @@ def compute_sentence_embedding(audio_path: str, sample_rate: int = 16000) -> np.
     Returns:
         np.ndarray: 768-dimensional embedding vector
     """
-    import librosa
-    
     # Load audio file
     try:
-        audio, sr = librosa.load(audio_path, sr=sample_rate)
+        audio = load_audio_array(audio_path, sample_rate)
     except Exception as e:
         logger.error(f"Failed to load audio for embedding: {str(e)}")
         return np.zeros(settings.SCORING_CONFIG.get('EMBEDDING_DIM', 768))
@@ -125,7 +265,7 @@ def compute_sentence_embedding(audio_path: str, sample_rate: int = 16000) -> np.
     return audio_to_embedding(audio, sample_rate)
 
 
-def compute_reference_embeddings(sentence) -> List[np.ndarray]:
+def compute_reference_embeddings(sentence) -> np.ndarray:
     """
     Compute reference embeddings for a sentence.
     
@@ -135,7 +275,7 @@ def compute_reference_embeddings(sentence) -> List[np.ndarray]:
         sentence: ReferenceSentence model instance
     
     Returns:
-        List of embedding vectors for each phoneme
+        np.ndarray: (N, D) L2-normalized embeddings, one row per phoneme
     """
     from .audio_cleaner import clean_audio
     from .audio_slicer import slice_audio_by_timestamps
@@ -153,36 +293,133 @@ def compute_reference_embeddings(sentence) -> List[np.ndarray]:
     # Slice audio
     slices = slice_audio_by_timestamps(cleaned_path, timestamps)
     
-    # Generate embeddings
-    embeddings = batch_audio_to_embeddings(slices)
+    # Generate embeddings, normalized once here instead of on every assessment
+    return normalize_embeddings(batch_audio_to_embeddings(slices))
+
+
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """
+    Stack embeddings into an (N, D) float32 matrix with unit-length rows.
+    
+    Reference embeddings are stored normalized so scoring only has to
+    normalize the user side. Zero rows are left as zeros.
     
-    return embeddings
+    Args:
+        embeddings: List of vectors or an (N, D) array
+    
+    Returns:
+        np.ndarray: Normalized embedding matrix
+    """
+    if len(embeddings) == 0:
+        return np.zeros((0, settings.SCORING_CONFIG.get('EMBEDDING_DIM', 768)), dtype=np.float32)
+    
+    matrix = np.array(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.maximum(norms, 1e-12)
+    return matrix
 
 
 def serialize_embeddings(embeddings: List[np.ndarray]) -> bytes:
     """
     Serialize embeddings for database storage.
     
+    Stored as a single float16 .npy buffer rather than a pickled list.
+    Reference rows are unit length, so half precision keeps cosine
+    scores accurate to ~1e-3 while halving the stored size.
+    
     Args:
-        embeddings: List of numpy arrays
+        embeddings: List of numpy arrays or an (N, D) matrix
     
     Returns:
-        bytes: Pickled embeddings
+        bytes: .npy-encoded (N, D) float16 matrix
     """
-    return pickle.dumps(embeddings)
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(embeddings, dtype=np.float16), allow_pickle=False)
+    return buffer.getvalue()
 
 
-def deserialize_embeddings(data: bytes) -> List[np.ndarray]:
+def deserialize_embeddings(data: bytes) -> np.ndarray:
     """
     Deserialize embeddings from database.
     
     Args:
-        data: Pickled embeddings
+        data: .npy-encoded matrix, or a pickled list from older rows
+    
+    Returns:
+        np.ndarray: (N, D) float32 embedding matrix
+    """
+    data = bytes(data)
+    if data.startswith(_NPY_MAGIC):
+        # float16 on disk (older .npy rows are float32); score in float32
+        return np.load(io.BytesIO(data), allow_pickle=False).astype(np.float32, copy=False)
+    
+    # Rows written before the .npy format
+    return np.asarray(pickle.loads(data))
+
+
+def load_reference_embeddings(sentence) -> np.ndarray:
+    """
+    Load a sentence's reference embeddings as a shared (N, D) float32 matrix.
+    
+    The stored blob is deserialized once per process and reused until the
+    sentence is saved again, so assessments skip per-request decoding.
+    Rows are L2-normalized (older blobs were stored raw). The returned
+    matrix is read-only because it is shared between requests.
+    
+    Args:
+        sentence: ReferenceSentence model instance with stored embeddings
     
     Returns:
-        List of numpy arrays
+        np.ndarray: Normalized reference embeddings, one row per phoneme
     """
-    return pickle.loads(data)
+    key = (sentence.pk, sentence.updated_at)
+    
+    with _reference_lock:
+        matrix = _reference_cache.get(key)
+        if matrix is not None:
+            _reference_cache.move_to_end(key)
+            return matrix
+    
+    matrix = normalize_embeddings(deserialize_embeddings(sentence.reference_embeddings))
+    matrix.setflags(write=False)
+    
+    with _reference_lock:
+        _reference_cache[key] = matrix
+        while len(_reference_cache) > _REFERENCE_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+    
+    return matrix
+
+
+def embedding_distances(
+    embeddings1: np.ndarray,
+    embeddings2: np.ndarray,
+    metric: str = 'cosine'
+) -> np.ndarray:
+    """
+    Calculate row-wise distances between two (N, D) embedding matrices.
+    
+    Args:
+        embeddings1: First embeddings, one row per vector
+        embeddings2: Second embeddings, same shape as embeddings1
+        metric: Distance metric ('cosine' or 'euclidean')
+    
+    Returns:
+        np.ndarray: N distance values (cosine distance is NaN for zero vectors)
+    """
+    embeddings1 = np.atleast_2d(np.asarray(embeddings1, dtype=np.float64))
+    embeddings2 = np.atleast_2d(np.asarray(embeddings2, dtype=np.float64))
+    
+    if metric == 'cosine':
+        # Cosine distance (1 - cosine similarity), clipped like SciPy's
+        norms = np.linalg.norm(embeddings1, axis=1) * np.linalg.norm(embeddings2, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.einsum('ij,ij->i', embeddings1, embeddings2) / norms
+        return np.clip(1.0 - similarity, 0.0, 2.0)
+    elif metric == 'euclidean':
+        return np.linalg.norm(embeddings1 - embeddings2, axis=1)
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
 
 
 def embedding_distance(emb1: np.ndarray, emb2: np.ndarray, metric: str = 'cosine') -> float:
@@ -197,11 +434,4 @@ def embedding_distance(emb1: np.ndarray, emb2: np.ndarray, metric: str = 'cosine
     Returns:
         float: Distance value
     """
-    if metric == 'cosine':
-        # Cosine distance (1 - cosine similarity)
-        from scipy.spatial.distance import cosine
-        return cosine(emb1, emb2)
-    elif metric == 'euclidean':
-        return np.linalg.norm(emb1 - emb2)
-    else:
-        raise ValueError(f"Unknown metric: {metric}")
+    return float(embedding_distances(emb1, emb2, metric)[0])
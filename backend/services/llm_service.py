@@ -12,14 +12,40 @@ LLM must NEVER:
 """
 
 import os
+import re
 import json
 import logging
 import hashlib
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import orjson
+    _loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fence around a JSON payload
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# Trailing commas before a closing bracket, a common LLM JSON slip
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+# Per-provider request timeout (seconds) so a hung socket cannot stall a request
+PROVIDER_TIMEOUT = 15.0
+
+# Head start given to the primary provider before the backup is called
+HEDGE_DELAY = 1.0
+
+# Near-deterministic responses are reused for a week; creative calls are never cached
+LLM_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+
 
 class LLMService:
     """
@@ -31,16 +57,21 @@ class LLMService:
     def __init__(self):
         self.groq_client = None
         self.cerebras_client = None
+        self.http_client = None
         self._init_clients()
     
     def _init_clients(self):
         """Initialize LLM client connections."""
+        # One keep-alive connection pool shared by every provider SDK
+        self.http_client = self._build_http_client()
+        client_kwargs = {'http_client': self.http_client} if self.http_client else {}
+        
         # Groq
         groq_key = settings.GROQ_API_KEY
         if groq_key:
             try:
                 from groq import Groq
-                self.groq_client = Groq(api_key=groq_key)
+                self.groq_client = Groq(api_key=groq_key, **client_kwargs)
                 logger.info("Groq client initialized")
             except ImportError:
                 logger.warning("Groq package not installed")
@@ -52,13 +83,37 @@ class LLMService:
         if cerebras_key:
             try:
                 from cerebras.cloud.sdk import Cerebras
-                self.cerebras_client = Cerebras(api_key=cerebras_key)
+                self.cerebras_client = Cerebras(api_key=cerebras_key, **client_kwargs)
                 logger.info("Cerebras client initialized")
             except ImportError:
                 logger.warning("Cerebras package not installed")
             except Exception as e:
                 logger.error(f"Cerebras init failed: {str(e)}")
     
+    def _build_http_client(self):
+        """
+        Build the pooled HTTP client passed to the provider SDKs.
+        
+        Reusing connections skips a TCP+TLS handshake per feedback request.
+        HTTP/2 is used when the optional h2 package is installed.
+        """
+        try:
+            import httpx
+        except ImportError:
+            return None
+        
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        
+        return httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            timeout=30.0,
+        )
+    
     def generate(
         self, 
         prompt: str, 
@@ -81,30 +136,50 @@ class LLMService:
             dict: {success: bool, content: str/dict, provider: str}
         """
         providers = self._get_provider_order(provider)
+        prompt_hash = hashlib.sha1(prompt.encode()).hexdigest()
         
-        for prov in providers:
-            try:
-                result = self._call_provider(prov, prompt, max_tokens, temperature)
-                
-                if result:
-                    content = result
-                    
-                    # Parse JSON if requested
-                    if response_format == "json":
-                        content = self._parse_json_response(result)
-                    
-                    # Log for auditing
-                    self._log_usage(prov, prompt, result)
-                    
-                    return {
-                        'success': True,
-                        'content': content,
-                        'provider': prov,
-                    }
-                    
-            except Exception as e:
-                logger.warning(f"Provider {prov} failed: {str(e)}")
-                continue
+        cache_key = None
+        if providers and temperature <= LLM_CACHE_MAX_TEMPERATURE:
+            cache_key = f"llm:{providers[0]}:{prompt_hash}:{temperature}:{max_tokens}:{response_format}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM cache hit")
+                return cached
+        
+        # Hedge the top two providers in auto mode; explicit providers stay sequential
+        if provider == "auto" and len(providers) > 1:
+            hit = self._race_providers(providers[:2], prompt, max_tokens, temperature)
+            remaining = providers[2:]
+        else:
+            hit = None
+            remaining = providers
+        
+        for prov in remaining:
+            if hit:
+                break
+            result = self._try_provider(prov, prompt, max_tokens, temperature)
+            if result:
+                hit = (prov, result)
+        
+        if hit:
+            prov, result = hit
+            content = result
+            
+            # Parse JSON if requested
+            if response_format == "json":
+                content = self._parse_json_response(result)
+            
+            # Log for auditing
+            self._log_usage(prov, prompt_hash, result)
+            
+            response = {
+                'success': True,
+                'content': content,
+                'provider': prov,
+            }
+            if cache_key and not (isinstance(content, dict) and content.get('parse_error')):
+                cache.set(cache_key, response, LLM_CACHE_TIMEOUT)
+            return response
         
         return {
             'success': False,
@@ -112,6 +187,85 @@ class LLMService:
             'content': None,
         }
     
+    def _try_provider(
+        self,
+        provider: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Optional[str]:
+        """Call one provider, logging and swallowing its failure."""
+        try:
+            return self._call_provider(provider, prompt, max_tokens, temperature)
+        except Exception as e:
+            logger.warning(f"Provider {provider} failed: {str(e)}")
+            return None
+    
+    def _race_providers(
+        self,
+        providers: list,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Hedged call: start the next provider only if the previous one has
+        not answered within HEDGE_DELAY, and keep the first success.
+        
+        Each call gets its own short-lived executor so an abandoned slow
+        provider never holds a thread another request is waiting for.
+        Hedged calls skip SDK retries; the race itself is the retry.
+        
+        Args:
+            providers: Providers to race, in priority order
+            prompt: The prompt to send
+            max_tokens: Maximum response tokens
+            temperature: Creativity (0-1)
+        
+        Returns:
+            (provider, response) of the first non-empty result, or None
+        """
+        executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix='llm-hedge')
+        futures = {}
+        pending = set()
+        
+        try:
+            for index, prov in enumerate(providers):
+                future = executor.submit(
+                    self._call_provider, prov, prompt, max_tokens, temperature, True
+                )
+                futures[future] = prov
+                pending.add(future)
+                
+                # Calls start on submit, so the last one gets a full timeout from its start
+                is_last = index == len(providers) - 1
+                deadline = time.monotonic() + (PROVIDER_TIMEOUT if is_last else HEDGE_DELAY)
+                
+                while pending:
+                    done, pending = wait(
+                        pending,
+                        timeout=max(0.0, deadline - time.monotonic()),
+                        return_when=FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+                    
+                    for done_future in done:
+                        try:
+                            result = done_future.result()
+                        except Exception as e:
+                            logger.warning(f"Provider {futures[done_future]} failed: {str(e)}")
+                            continue
+                        if result:
+                            return futures[done_future], result
+            
+            for future in pending:
+                logger.warning(f"Provider {futures[future]} timed out after {PROVIDER_TIMEOUT}s")
+            return None
+        finally:
+            # Losers still running finish in the background; results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def _get_provider_order(self, provider: str) -> list:
         """Get ordered list of providers to try."""
         if provider == "auto":
@@ -128,20 +282,23 @@ class LLMService:
         provider: str, 
         prompt: str, 
         max_tokens: int,
-        temperature: float
+        temperature: float,
+        hedged: bool = False
     ) -> Optional[str]:
-        """Call specific LLM provider."""
+        """Call specific LLM provider (without SDK retries when hedged)."""
         
         if provider == "groq" and self.groq_client:
-            return self._call_groq(prompt, max_tokens, temperature)
+            client = self.groq_client.with_options(max_retries=0) if hedged else self.groq_client
+            return self._call_groq(client, prompt, max_tokens, temperature)
         elif provider == "cerebras" and self.cerebras_client:
-            return self._call_cerebras(prompt, max_tokens, temperature)
+            client = self.cerebras_client.with_options(max_retries=0) if hedged else self.cerebras_client
+            return self._call_cerebras(client, prompt, max_tokens, temperature)
         
         return None
     
-    def _call_groq(self, prompt: str, max_tokens: int, temperature: float) -> str:
+    def _call_groq(self, client, prompt: str, max_tokens: int, temperature: float) -> str:
         """Call Groq API."""
-        response = self.groq_client.chat.completions.create(
+        response = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": "You are a helpful pronunciation coach. Always respond in valid JSON format."},
@@ -149,12 +306,13 @@ class LLMService:
             ],
             max_tokens=max_tokens,
             temperature=temperature,
+            timeout=PROVIDER_TIMEOUT,
         )
         return response.choices[0].message.content
     
-    def _call_cerebras(self, prompt: str, max_tokens: int, temperature: float) -> str:
+    def _call_cerebras(self, client, prompt: str, max_tokens: int, temperature: float) -> str:
         """Call Cerebras API."""
-        response = self.cerebras_client.chat.completions.create(
+        response = client.chat.completions.create(
             model="llama-3.3-70b",
             messages=[
                 {"role": "system", "content": "You are a helpful pronunciation coach. Always respond in valid JSON format."},
@@ -162,6 +320,7 @@ class LLMService:
             ],
             max_tokens=max_tokens,
             temperature=temperature,
+            timeout=PROVIDER_TIMEOUT,
         )
         return response.choices[0].message.content
     
@@ -174,34 +333,35 @@ class LLMService:
         - Markdown code blocks (```json or ```)
         - JSON embedded in text
         """
-        import re
-        
         original_content = content
         
         # Try 1: Handle markdown code blocks
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0]
-        elif "```" in content:
-            parts = content.split("```")
-            if len(parts) >= 2:
-                content = parts[1]
+        fence = _JSON_FENCE.search(content)
+        if fence:
+            content = fence.group(1)
+        
+        try:
+            return _loads(content.strip())
+        except json.JSONDecodeError:
+            pass
         
+        # Try 2: Same content with trailing commas removed
         try:
-            return json.loads(content.strip())
+            return _loads(_TRAILING_COMMA.sub(r'\1', content.strip()))
         except json.JSONDecodeError:
             pass
         
-        # Try 2: Find JSON object in text using regex
+        # Try 3: Find JSON object in text using regex
         json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
         matches = re.findall(json_pattern, original_content)
         
         for match in matches:
             try:
-                return json.loads(match)
+                return _loads(_TRAILING_COMMA.sub(r'\1', match))
             except json.JSONDecodeError:
                 continue
         
-        # Try 3: Find JSON with nested objects
+        # Try 4: Find JSON with nested objects
         start_idx = original_content.find('{')
         if start_idx != -1:
             # Find matching closing brace
@@ -214,7 +374,7 @@ class LLMService:
                     if brace_count == 0:
                         json_str = original_content[start_idx:start_idx + i + 1]
                         try:
-                            return json.loads(json_str)
+                            return _loads(_TRAILING_COMMA.sub(r'\1', json_str))
                         except json.JSONDecodeError:
                             break
         
@@ -222,10 +382,9 @@ class LLMService:
         logger.warning("Failed to parse JSON response, returning as text")
         return {"raw_text": original_content, "parse_error": True}
     
-    def _log_usage(self, provider: str, prompt: str, response: str):
+    def _log_usage(self, provider: str, prompt_hash: str, response: str):
         """Log LLM usage for auditing."""
-        prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:8]
-        logger.info(f"LLM usage: provider={provider}, prompt_hash={prompt_hash}, response_len={len(response)}")
+        logger.info(f"LLM usage: provider={provider}, prompt_hash={prompt_hash[:8]}, response_len={len(response)}")
 
 
 # Singleton instance
@@ -6,12 +6,38 @@ Audio is cached to avoid repeated API calls.
 """
 
 import os
+import shutil
+import asyncio
+import hashlib
 import logging
+import uuid
 from pathlib import Path
+from typing import List, Union
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Concurrent Groq requests per batch (bounded by the API rate limit)
+TTS_BATCH_CONCURRENCY = 8
+
+
+def _truncate_text(text: str) -> str:
+    """Truncate text to the 200 character API limit."""
+    if len(text) > 200:
+        logger.warning(f"Text truncated to 200 chars for TTS")
+        return text[:197] + "..."
+    return text
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hard-link src to dst (copying when the filesystem cannot link), replacing dst atomically."""
+    tmp_path = f"{dst}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
 
 class TTSService:
     """
@@ -40,10 +66,21 @@ class TTSService:
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {str(e)}")
     
+    def _cache_path(self, text: str, voice: str) -> str:
+        """Content-addressed cache location for (model, voice, text)."""
+        media_dir = Path(settings.MEDIA_ROOT) / 'references'
+        media_dir.mkdir(parents=True, exist_ok=True)
+        
+        key = hashlib.sha1(f"{self.model}|{voice}|{text}".encode()).hexdigest()[:16]
+        return str(media_dir / f"tts_{key}.wav")
+    
     def generate_audio(self, text: str, output_path: str = None, voice: str = None) -> str:
         """
         Generate speech audio from text using Groq Orpheus.
         
+        Synthesized audio is cached by (model, voice, text); repeated
+        requests are served from disk without calling the API.
+        
         Args:
             text: Text to convert to speech (max 200 chars)
             output_path: Optional path to save audio file
@@ -52,15 +89,19 @@ class TTSService:
         Returns:
             str: Path to generated audio file
         """
-        if not self.client:
-            raise ValueError("TTS client not initialized. Check GROQ_API_KEY.")
+        text = _truncate_text(text)
+        voice = voice or self.voice
+        cache_path = self._cache_path(text, voice)
+        output_path = output_path or cache_path
         
-        # Truncate text if too long (API limit is 200 chars)
-        if len(text) > 200:
-            text = text[:197] + "..."
-            logger.warning(f"Text truncated to 200 chars for TTS")
+        if os.path.exists(cache_path):
+            logger.info(f"TTS cache hit: {cache_path}")
+            if output_path != cache_path:
+                _link_or_copy(cache_path, output_path)
+            return output_path
         
-        voice = voice or self.voice
+        if not self.client:
+            raise ValueError("TTS client not initialized. Check GROQ_API_KEY.")
         
         try:
             # Generate speech
@@ -71,18 +112,13 @@ class TTSService:
                 response_format="wav"
             )
             
-            # Determine output path
-            if output_path is None:
-                media_dir = Path(settings.MEDIA_ROOT) / 'references'
-                media_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Create filename from text hash
-                import hashlib
-                text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-                output_path = str(media_dir / f"tts_{text_hash}.wav")
+            # Write under a temporary name so readers never see a partial cache file
+            tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+            response.write_to_file(tmp_path)
+            os.replace(tmp_path, cache_path)
             
-            # Save to file
-            response.write_to_file(output_path)
+            if output_path != cache_path:
+                _link_or_copy(cache_path, output_path)
             
             logger.info(f"TTS audio generated: {output_path}")
             return output_path
@@ -101,17 +137,84 @@ class TTSService:
         Returns:
             str: Path to generated audio file
         """
-        # Create unique filename based on sentence ID
-        media_dir = Path(settings.MEDIA_ROOT) / 'references'
-        media_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_path = str(media_dir / f"sentence_{sentence.id}.wav")
-        
-        # Generate audio
+        # Generate audio (served from the content cache when the text was synthesized before)
         return self.generate_audio(
             text=sentence.text,
-            output_path=output_path
+            output_path=self._sentence_path(sentence)
         )
+    
+    def generate_for_sentences(self, sentences: List) -> List[Union[str, Exception]]:
+        """
+        Generate reference audio for several sentences concurrently.
+        
+        Args:
+            sentences: ReferenceSentence model instances
+        
+        Returns:
+            list: Audio path per sentence, or the exception it failed with
+        """
+        return asyncio.run(self.generate_for_sentences_async(sentences))
+    
+    async def generate_for_sentences_async(self, sentences: List) -> List[Union[str, Exception]]:
+        """
+        Async batch variant of generate_for_sentence.
+        
+        Network-bound synthesis calls overlap, with at most
+        TTS_BATCH_CONCURRENCY requests in flight.
+        
+        Args:
+            sentences: ReferenceSentence model instances
+        
+        Returns:
+            list: Audio path per sentence, or the exception it failed with
+        """
+        if not self.api_key:
+            raise ValueError("TTS client not initialized. Check GROQ_API_KEY.")
+        
+        from groq import AsyncGroq
+        
+        client = AsyncGroq(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(TTS_BATCH_CONCURRENCY)
+        
+        try:
+            return await asyncio.gather(
+                *(
+                    self._generate_audio_async(client, semaphore, s.text, self._sentence_path(s))
+                    for s in sentences
+                ),
+                return_exceptions=True
+            )
+        finally:
+            await client.close()
+    
+    async def _generate_audio_async(self, client, semaphore, text: str, output_path: str) -> str:
+        """Async counterpart of generate_audio sharing the same disk cache."""
+        text = _truncate_text(text)
+        cache_path = self._cache_path(text, self.voice)
+        
+        if not os.path.exists(cache_path):
+            async with semaphore:
+                response = await client.audio.speech.create(
+                    model=self.model,
+                    voice=self.voice,
+                    input=text,
+                    response_format="wav"
+                )
+                tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+                await response.write_to_file(tmp_path)
+            os.replace(tmp_path, cache_path)
+        else:
+            logger.info(f"TTS cache hit: {cache_path}")
+        
+        _link_or_copy(cache_path, output_path)
+        logger.info(f"TTS audio generated: {output_path}")
+        return output_path
+    
+    def _sentence_path(self, sentence) -> str:
+        """Per-sentence audio path (unique filename based on sentence ID)."""
+        media_dir = Path(settings.MEDIA_ROOT) / 'references'
+        media_dir.mkdir(parents=True, exist_ok=True)
+        return str(media_dir / f"sentence_{sentence.id}.wav")
 
 
 # Singleton instance